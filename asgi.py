@@ -0,0 +1,262 @@
+import asyncio
+import datetime
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.http import parse_accept_header
+from app import app as flask_app, CORS_ORIGINS
+from blueprints import dashboard
+from extensions import DATABASE_NAME, SERVER_THREADS, start_background_services
+from metrics import command_listener
+from mongo_config import client_options, read_preference
+import metrics
+import responses
+
+# İsteğe bağlı ASGI modu. Bağımsız sorgular yapan okuma endpoint'leri (/upcoming-payments, /payments,
+# /home/messages) asyncio ve async MongoDB sürücüsüyle (motor) çalışır: sorgular asyncio.gather ile aynı anda
+# gider ve beklerken thread tutulmaz. Diğer tüm route'lar aynı Flask uygulamasına SERVER_THREADS boyutlu bir
+# thread havuzunda iletilir. Route'lar ve yanıt biçimleri WSGI moduyla aynıdır.
+#   pip install -r requirements-asgi.txt
+#   SERVER_THREADS=32 uvicorn asgi:application --workers 4
+
+
+class AsyncDatabases:
+    """motor istemcisini ilk istekte (çalışan event loop içinde) oluşturur; iş yükü başına veritabanı nesnesi"""
+
+    def __init__(self):
+        self.client = None
+        self._dbs = {}
+
+    def get(self, workload=None):
+        if self.client is None:
+            # motor yalnızca ASGI modunda gerekir
+            from motor.motor_asyncio import AsyncIOMotorClient
+            self.client = AsyncIOMotorClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'),
+                                             event_listeners=[command_listener], **client_options())
+        db = self._dbs.get(workload)
+        if db is None:
+            options = {} if workload is None else {'read_preference': read_preference(workload)}
+            db = self._dbs[workload] = self.client.get_database(DATABASE_NAME, **options)
+        return db
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self._dbs = {}
+
+
+async def _total(collection, match, field):
+    result = await collection.aggregate(dashboard.sum_pipeline(match, field)).to_list(1)
+    return result[0]['total'] if result else 0
+
+
+async def get_upcoming_payments(databases, headers):
+    email = headers.get('x-user-email')
+    if not email:
+        return 401, {'error': 'Kullanıcı bilgisi bulunamadı'}
+    try:
+        db = databases.get()
+        card_query, bill_query = dashboard.upcoming_payment_queries(email, datetime.datetime.now())
+        cards_list, bills_list = await asyncio.gather(
+            db.credit_cards.find(*card_query).to_list(None),
+            db.bills.find(*bill_query).to_list(None)
+        )
+        return 200, {'payments': dashboard.merge_upcoming_payments(cards_list, bills_list)}
+    except Exception as e:
+        print(f"Error in get_upcoming_payments: {str(e)}")
+        return 500, {'error': str(e)}
+
+
+async def get_payments(databases, headers):
+    user_email = headers.get('x-user-email')
+    if not user_email:
+        return 401, {'error': 'User not authenticated'}
+    try:
+        db = databases.get('summaries')
+        bill_query, card_query = dashboard.paid_total_queries(user_email)
+        bill_total, card_total = await asyncio.gather(
+            _total(db.bills, *bill_query),
+            _total(db.credit_cards, *card_query)
+        )
+        return 200, {'total_payments': bill_total + card_total}
+    except Exception as e:
+        print(f"Error in get_payments: {str(e)}")
+        return 500, {'error': str(e)}
+
+
+async def get_home_messages(databases, headers):
+    user_email = headers.get('x-user-email')
+    db = databases.get('summaries')
+    now = datetime.datetime.now()
+    # Bütçe ve bu ayın kategori toplamları aynı anda okunur
+    user_budget, totals = await asyncio.gather(
+        db.budgets.find_one({'email': user_email}),
+        db[dashboard.SPENDING_LOGS].aggregate(
+            dashboard.monthly_category_pipeline(user_email, now.year, now.month)).to_list(None)
+    )
+    if not user_budget:
+        return 404, {'error': 'Budget not found'}
+    totals = {item['_id']: item['total'] for item in totals}
+    return 200, {'messages': dashboard.home_messages(totals, user_budget['initial_budget'])}
+
+
+# Async çalışan route'lar; burada olmayan her istek Flask uygulamasına gider
+ASYNC_ROUTES = {
+    ('GET', '/upcoming-payments'): get_upcoming_payments,
+    ('GET', '/payments'): get_payments,
+    ('GET', '/home/messages'): get_home_messages,
+}
+
+
+def wsgi_environ(scope, body):
+    """ASGI HTTP scope'undan WSGI environ sözlüğü oluşturur"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # Gövde tamamen okunduğu için (chunked istekler dahil) uzunluk bellidir
+    environ['CONTENT_LENGTH'] = str(len(body))
+    environ.pop('HTTP_TRANSFER_ENCODING', None)
+    return environ
+
+
+class AsgiApp:
+    def __init__(self, app, workers=SERVER_THREADS):
+        self.app = app
+        # Flask istekleri bu havuzda çalışır; eşzamanlılık WSGI modundaki sunucu thread'leriyle aynıdır
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wsgi')
+        self.databases = AsyncDatabases()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            handler = ASYNC_ROUTES.get((scope['method'], scope['path']))
+            if handler is None:
+                await self._call_flask(scope, receive, send)
+            else:
+                await self._call_async(handler, scope, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.app.config['BACKGROUND_SERVICES']:
+                    await asyncio.get_running_loop().run_in_executor(
+                        self.executor, start_background_services, self.app)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.databases.close()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _call_async(self, handler, scope, send):
+        started = time.perf_counter()
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        try:
+            status, payload = await handler(self.databases, headers)
+            body = responses.dumps(payload, self.app.json.sort_keys) + b'\n'
+            content_type = b'application/json'
+        except Exception as e:
+            print(f"Error in {scope['path']}: {str(e)}")
+            status, body, content_type = 500, b'Internal Server Error', b'text/plain; charset=utf-8'
+
+        # Flask tarafındaki sıkıştırma, CORS ve metrik davranışının aynısı
+        response_headers = [(b'content-type', content_type)]
+        config = self.app.config
+        if config['COMPRESSION']:
+            response_headers.append((b'vary', b'Accept-Encoding'))
+            body, encoding = responses.compress_body(
+                body, parse_accept_header(headers.get('accept-encoding')), scope['path'],
+                config['COMPRESS_MIN_SIZE'], config['COMPRESS_LEVEL'], config['BROTLI_QUALITY'])
+            if encoding:
+                response_headers.append((b'content-encoding', encoding.encode('ascii')))
+        # flask-cors ile aynı: Origin eşleşirse o, Origin yoksa tüm izinli adresler gönderilir
+        origin = headers.get('origin')
+        allowed = [origin] if origin in CORS_ORIGINS else [] if origin else sorted(CORS_ORIGINS)
+        response_headers += [(b'access-control-allow-origin', value.encode('latin-1')) for value in allowed]
+        if allowed and len(CORS_ORIGINS) > 1:
+            response_headers.append((b'vary', b'Origin'))
+        response_headers.append((b'content-length', str(len(body)).encode('ascii')))
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+        await send({'type': 'http.response.body', 'body': body})
+        metrics.http_request_duration.observe(time.perf_counter() - started, method=scope['method'],
+                                              route=scope['path'])
+        metrics.http_requests.inc(method=scope['method'], route=scope['path'], status=status)
+
+    async def _call_flask(self, scope, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._run_flask, loop, wsgi_environ(scope, bytes(body)), send)
+
+    def _run_flask(self, loop, environ, send):
+        """Flask'ı havuz thread'inde çalıştırır. Akıtılan yanıtlar (ör. /export) parça parça gönderilir;
+        uygulama ve yanıt üreteci aynı thread'de kalır, her parça gönderilene kadar beklenir."""
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        def start():
+            if not response.get('started'):
+                response['started'] = True
+                send_sync({'type': 'http.response.start', 'status': response['status'],
+                           'headers': response['headers']})
+
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    start()
+                    send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            start()
+            send_sync({'type': 'http.response.body', 'body': b''})
+        finally:
+            close = getattr(result, 'close', None)
+            if close:
+                close()
+
+
+application = AsgiApp(flask_app)
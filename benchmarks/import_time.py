@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_budget.json')
+
+
+def measure(module, runs=5):
+    """Modülü temiz bir süreçte `python -X importtime` ile import eder.
+    (en iyi kümülatif süre ms, import edilen modüller, en pahalı modüller) döndürür"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT, capture_output=True, text=True,
+            env=dict(os.environ, BACKGROUND_SERVICES='False')
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f'import {module} failed:\n{result.stderr}')
+
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            timings[name.strip()] = int(cumulative) / 1000
+        if best is None or timings[module] < best[0]:
+            best = (timings[module], timings)
+
+    total, timings = best
+    slowest = sorted(((ms, name) for name, ms in timings.items() if '.' not in name and name != module),
+                     reverse=True)[:15]
+    return total, set(timings), slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Uygulamanın import süresini ölçer; bütçe aşılırsa veya ağır modüller yüklenirse hata verir')
+    parser.add_argument('--budget', default=DEFAULT_BUDGET, help='Bütçe dosyası (JSON)')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+
+    total, modules, slowest = measure(budget['module'], args.runs)
+    loaded = sorted(name for name in budget['forbidden_modules'] if name in modules)
+
+    print(f"import {budget['module']}: {total:.1f} ms (budget {budget['budget_ms']} ms)")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+    for name in loaded:
+        print(f"Heavy module imported at startup: {name}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'module': budget['module'], 'import_ms': total, 'budget_ms': budget['budget_ms'],
+                       'slowest': [{'module': name, 'ms': ms} for ms, name in slowest],
+                       'heavy_modules': loaded}, f, indent=2)
+
+    if total > budget['budget_ms'] or loaded:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
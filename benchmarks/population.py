@@ -0,0 +1,149 @@
+import datetime
+import math
+import random
+import bcrypt
+from indexes import ensure_indexes
+from leader import shard_key
+from rollups import rebuild_rollups
+from spending_storage import SPENDING_LOGS
+
+# Sentetik kullanıcı nüfusu. Aynı tohum (seed) ve parametrelerle her seferinde aynı veri üretilir.
+
+PASSWORD = 'bench-password'
+BANKS = ['Ziraat', 'İş Bankası', 'Garanti', 'Akbank', 'Yapı Kredi', 'QNB', 'Denizbank']
+BILL_CATEGORIES = {
+    # kategori: (ortalama tutar TL, log-normal sigma)
+    'Elektrik': (650, 0.4), 'Su': (250, 0.3), 'Doğalgaz': (900, 0.6), 'İnternet': (400, 0.1),
+    'Telefon': (350, 0.3), 'Kira': (15000, 0.4), 'Aidat': (1200, 0.3),
+}
+SPENDING_CATEGORIES = {
+    # kategori: (ağırlık, ortalama tutar TL, log-normal sigma)
+    'Market': (30, 450, 0.8), 'Restoran': (15, 600, 0.7), 'Ulaşım': (20, 120, 0.6), 'Giyim': (6, 1500, 0.8),
+    'Eğlence': (8, 500, 0.9), 'Sağlık': (4, 900, 1.0), 'Eğitim': (5, 2500, 0.9), 'Spor': (4, 700, 0.7),
+    'Diğer': (8, 300, 1.0),
+}
+
+
+def user_email(index):
+    return f'user{index}@bench.local'
+
+
+def _lognormal(rng, mean, sigma):
+    # mean, dağılımın medyanı olarak kullanılır
+    return round(rng.lognormvariate(math.log(mean), sigma), 2)
+
+
+def _batched(docs, batch_size):
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(collection, docs, batch_size):
+    count = 0
+    for batch in _batched(docs, batch_size):
+        collection.insert_many(batch, ordered=False)
+        count += len(batch)
+    return count
+
+
+def generate_user(rng, index, today, logs_per_user):
+    """Bir kullanıcının (kullanıcı, bütçe, kartlar, faturalar, harcamalar) belgelerini üretir"""
+    email = user_email(index)
+    budget = {'email': email, 'initial_budget': _lognormal(rng, 40000, 0.5), 'shard_key': shard_key(email)}
+    if rng.random() < 0.2:
+        budget['alert_threshold'] = rng.choice([500, 1000, 2000])
+
+    cards = []
+    card_count = rng.choices([0, 1, 2, 3, 4], weights=[20, 35, 25, 15, 5])[0]
+    for bank in rng.sample(BANKS, card_count):
+        limit = rng.choice([5000, 10000, 20000, 50000])
+        due = today + datetime.timedelta(days=rng.randint(-10, 40))
+        cards.append({
+            'email': email,
+            'bank_name': bank,
+            'card_limit': limit,
+            'due_date_start': (due - datetime.timedelta(days=10)).strftime('%Y-%m-%d'),
+            'due_date_end': due.strftime('%Y-%m-%d'),
+            'current_balance': round(rng.uniform(0, limit * 0.8), 2)
+        })
+
+    bills = []
+    for number in range(rng.randint(2, 12)):
+        category = rng.choice(list(BILL_CATEGORIES))
+        mean, sigma = BILL_CATEGORIES[category]
+        end = today + datetime.timedelta(days=rng.randint(-180, 60))
+        bills.append({
+            'email': email,
+            'bill_name': f'{category} {number + 1}',
+            'amount': _lognormal(rng, mean, sigma),
+            'category': category,
+            'start_date': (end - datetime.timedelta(days=30)).strftime('%Y-%m-%d'),
+            'end_date': end.strftime('%Y-%m-%d'),
+            # Geçmiş faturaların çoğu ödenmiş, gelecektekiler ödenmemiş
+            'is_paid': end < today and rng.random() < 0.85,
+            'is_notification_enabled': rng.random() < 0.9,
+            'last_notification_date': None,
+            'shard_key': shard_key(email)
+        })
+
+    # Harcama sayısı ağır kuyruklu: çoğu kullanıcı ortalamanın altında, az sayıda çok aktif kullanıcı
+    log_count = min(int(rng.lognormvariate(math.log(max(logs_per_user, 1)), 0.8)), logs_per_user * 20)
+    names = list(SPENDING_CATEGORIES)
+    weights = [SPENDING_CATEGORIES[name][0] for name in names]
+    now = datetime.datetime.combine(today, datetime.time())
+    logs = []
+    for category in rng.choices(names, weights=weights, k=log_count):
+        _, mean, sigma = SPENDING_CATEGORIES[category]
+        logs.append({
+            'email': email,
+            'category': category,
+            'amount': _lognormal(rng, mean, sigma),
+            'date': now - datetime.timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+        })
+
+    return email, budget, cards, bills, logs
+
+
+def seed(db, users, logs_per_user=200, seed=42, batch_size=5000, rounds=4):
+    """Veritabanını sentetik nüfusla doldurur; koleksiyon başına toplu insert_many kullanır.
+    Tüm kullanıcıların şifresi PASSWORD'dür (bcrypt maliyeti `rounds`)."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+    ensure_indexes(db)
+    buffers = {'users': [], 'budgets': [], 'credit_cards': [], 'bills': [], 'spending_logs': []}
+    counts = dict.fromkeys(buffers, 0)
+
+    def flush(force=False):
+        for name, docs in buffers.items():
+            if docs and (force or len(docs) >= batch_size):
+                # Harcamalar aktif saklama moduna (SPENDING_STORAGE) yazılır
+                collection = db[SPENDING_LOGS] if name == 'spending_logs' else db[name]
+                counts[name] += _insert(collection, docs, batch_size)
+                docs.clear()
+
+    for index in range(users):
+        email, budget, cards, bills, logs = generate_user(rng, index, today, logs_per_user)
+        buffers['users'].append({'username': f'user{index}', 'email': email, 'password': password_hash})
+        buffers['budgets'].append(budget)
+        buffers['credit_cards'].extend(cards)
+        buffers['bills'].extend(bills)
+        buffers['spending_logs'].extend(logs)
+        flush()
+    flush(force=True)
+
+    # Harcama toplamları ham kayıtlardan bir kez hesaplanır
+    counts['spending_totals'] = rebuild_rollups(db['spending_totals'], db[SPENDING_LOGS])
+    return counts
+
+
+def drop(db):
+    """Benchmark veritabanını tamamen siler"""
+    db.client.drop_database(db.name)
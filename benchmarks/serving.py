@@ -0,0 +1,64 @@
+import argparse
+import datetime
+import json
+import uuid
+from benchmarks import suite
+
+# Aynı veritabanına bağlı iki sunucuyu aynı senaryolarla ölçer: WSGI (ör. gunicorn app:app) ve
+# ASGI (uvicorn asgi:application). Varsayılan senaryolar ASGI modunda async çalışan üç endpoint ile
+# Flask'a iletilen bir okuma endpoint'idir; böylece hem async sorguların hem köprünün maliyeti görülür.
+
+ASYNC_SCENARIOS = ['GET /upcoming-payments', 'GET /payments', 'GET /home/messages']
+DELEGATED_SCENARIOS = ['GET /budget']
+
+
+def _change(before, after):
+    if not before or after is None:
+        return ''
+    return f"({(after - before) / before * 100:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WSGI ve ASGI sunucularının gecikme ve verim karşılaştırması')
+    parser.add_argument('--wsgi-url', required=True, help='ör. http://localhost:8000')
+    parser.add_argument('--asgi-url', required=True, help='ör. http://localhost:8001')
+    parser.add_argument('--users', type=int, default=1000, help='Tohumlanan kullanıcı sayısı (suite ile aynı)')
+    parser.add_argument('--routes', nargs='*', default=ASYNC_SCENARIOS + DELEGATED_SCENARIOS)
+    parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 8, 32, 128])
+    parser.add_argument('--requests', type=int, default=500, help='Senaryo, sunucu ve eşzamanlılık başına istek')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    scenarios = [scenario for scenario in suite.SCENARIOS if scenario['name'] in args.routes]
+    servers = {'wsgi': suite.http_sender(args.wsgi_url.rstrip('/')),
+               'asgi': suite.http_sender(args.asgi_url.rstrip('/'))}
+    ctx = suite.Context(args.users, uuid.uuid4().hex[:8])
+    results = {
+        'commit': suite._git_commit(),
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'targets': {'wsgi': args.wsgi_url, 'asgi': args.asgi_url},
+        'requests': args.requests,
+        'routes': {}
+    }
+    for scenario in scenarios:
+        results['routes'][scenario['name']] = {}
+        for level, concurrency in enumerate(args.concurrency):
+            # İki sunucu aynı kullanıcılarla ölçülür; sıra her seviyede değişir ki ısınma birini kayırmasın
+            order = ['wsgi', 'asgi'] if level % 2 == 0 else ['asgi', 'wsgi']
+            modes = {name: suite.run_scenario(servers[name], scenario, ctx, concurrency, args.requests,
+                                              level * args.requests)
+                     for name in order}
+            results['routes'][scenario['name']][str(concurrency)] = modes
+            wsgi, asgi = modes['wsgi'], modes['asgi']
+            print(f"{scenario['name']} c={concurrency}: "
+                  f"wsgi p50={wsgi['p50_ms']} p95={wsgi['p95_ms']} {wsgi['throughput_rps']:.1f} req/s, "
+                  f"asgi p50={asgi['p50_ms']} p95={asgi['p95_ms']} {asgi['throughput_rps']:.1f} req/s "
+                  f"{_change(wsgi['p95_ms'], asgi['p95_ms'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import datetime
+import json
+import random
+import time
+from pymongo import DESCENDING
+from benchmarks import population
+from benchmarks.suite import percentile
+from indexes import INDEXES
+from spending_storage import STORAGE_COLLECTIONS, ensure_collection, migrate, storage_stats
+
+# Aynı sentetik harcamaları iki saklama modunda (documents / timeseries) tutar; disk, index boyutu
+# ve endpoint'lerin tarih aralığı sorgularının gecikmesini karşılaştırır.
+
+DEFAULT_DATABASE = 'finance_bench_storage'
+
+
+def _create_indexes(collection, specs):
+    for spec in specs:
+        options = {k: v for k, v in spec.items() if k != 'keys'}
+        collection.create_index(spec['keys'], **options)
+
+
+def seed(db, users, logs_per_user, seed, batch_size=5000):
+    """Harcamaları documents koleksiyonuna yazar, migrate ile time-series koleksiyonuna kopyalar"""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    documents = db[STORAGE_COLLECTIONS['documents']]
+    _create_indexes(documents, INDEXES['spending_logs'])
+    batch = []
+    count = 0
+    for index in range(users):
+        batch.extend(population.generate_user(rng, index, today, logs_per_user)[4])
+        if len(batch) >= batch_size:
+            documents.insert_many(batch, ordered=False)
+            count += len(batch)
+            batch = []
+    if batch:
+        documents.insert_many(batch, ordered=False)
+        count += len(batch)
+
+    ensure_collection(db, 'timeseries')
+    _create_indexes(db[STORAGE_COLLECTIONS['timeseries']], INDEXES['spending_log_series'])
+    started = time.perf_counter()
+    copied = migrate(db, 'timeseries', batch_size)
+    return {'logs': count, 'migrated': copied, 'migrate_seconds': round(time.perf_counter() - started, 2)}
+
+
+def _queries(email, today):
+    """Endpoint'lerin harcama koleksiyonuna gönderdiği sorgu biçimleri"""
+    month_start = datetime.datetime(today.year, today.month, 1)
+    year_start = datetime.datetime(today.year, 1, 1)
+    return {
+        # /home/messages: aylık kategori toplamları
+        'month by category': lambda c: list(c.aggregate([
+            {'$match': {'email': email, 'date': {'$gte': month_start}}},
+            {'$group': {'_id': '$category', 'total': {'$sum': '$amount'}}}
+        ])),
+        # /generate_report (category): yıllık kategori toplamları
+        'year by category': lambda c: list(c.aggregate([
+            {'$match': {'email': email, 'date': {'$gte': year_start}}},
+            {'$group': {'_id': '$category', 'total': {'$sum': {'$toDouble': '$amount'}}}}
+        ])),
+        # /recent-expenses: ilk sayfa
+        'recent page': lambda c: list(c.find({'email': email}, {'category': 1, 'amount': 1, 'date': 1})
+                                      .sort([('date', DESCENDING), ('_id', DESCENDING)]).limit(20)),
+    }
+
+
+def run_queries(db, users, repeat, seed):
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    emails = [population.user_email(rng.randrange(users)) for _ in range(repeat)]
+    results = {}
+    for mode, name in STORAGE_COLLECTIONS.items():
+        collection = db[name]
+        latencies = {}
+        for email in emails:
+            for query, run in _queries(email, today).items():
+                started = time.perf_counter()
+                run(collection)
+                latencies.setdefault(query, []).append((time.perf_counter() - started) * 1000)
+        results[mode] = {query: {'p50_ms': round(percentile(sorted(values), 50), 2),
+                                 'p95_ms': round(percentile(sorted(values), 95), 2)}
+                         for query, values in latencies.items()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Harcama kayıtları için documents ve timeseries saklama modlarının karşılaştırması')
+    parser.add_argument('--mongodb-uri', default='mongodb://localhost:27017/')
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--logs-per-user', type=int, default=200, help='Kullanıcı başına medyan harcama sayısı')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-seed', action='store_true', help='Mevcut veriyi kullan')
+    parser.add_argument('--queries', type=int, default=200, help='Sorgu biçimi ve mod başına ölçüm')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    from pymongo import MongoClient
+    db = MongoClient(args.mongodb_uri)[args.database]
+    seed_info = None
+    if not args.skip_seed:
+        population.drop(db)
+        seed_info = seed(db, args.users, args.logs_per_user, args.seed)
+        print(f"Seeded {seed_info}")
+
+    results = {
+        'population': {'users': args.users, 'logs_per_user': args.logs_per_user, 'seed': args.seed},
+        'seed': seed_info,
+        'storage': {mode: storage_stats(db, name) for mode, name in STORAGE_COLLECTIONS.items()},
+        'queries': run_queries(db, args.users, args.queries, args.seed)
+    }
+    for mode, stats in results['storage'].items():
+        print(f"{mode}: {stats['documents']} logs, data {stats['size_bytes']} bytes, "
+              f"storage {stats['storage_bytes']} bytes, indexes {stats['index_bytes']} bytes")
+    for mode, queries in results['queries'].items():
+        for query, summary in queries.items():
+            print(f"{mode} {query}: p50={summary['p50_ms']} p95={summary['p95_ms']} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
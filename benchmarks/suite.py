@@ -0,0 +1,346 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks import population
+
+# Uygulamanın tüm endpoint'lerini sentetik nüfusa karşı eşzamanlı istemcilerle çalıştırır.
+# Varsayılan olarak uygulama bu süreçte (Flask test istemcisi) çalışır; --url ile çalışan bir
+# sunucu da ölçülebilir. Sonuçlar commit'ler arasında karşılaştırılabilecek JSON olarak yazılır.
+
+DEFAULT_DATABASE = 'finance_bench'
+
+
+def percentile(values, p):
+    """Sıralı listeden yüzdelik değeri döndürür"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'throughput_rps': (len(latencies) + errors) / elapsed if elapsed else 0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99)
+    }
+
+
+class Context:
+    """Senaryoların istek üretirken kullandığı nüfus bilgisi"""
+
+    def __init__(self, users, run_id):
+        self.users = users
+        self.run_id = run_id
+
+    def user(self, i):
+        # Ardışık istekler farklı kullanıcılara dağılsın
+        return population.user_email((i * 7919) % self.users)
+
+
+def _headers(email):
+    return {'X-User-Email': email}
+
+
+def _get(path, **params):
+    return lambda ctx, i: {'method': 'GET', 'path': path, 'params': params, 'headers': _headers(ctx.user(i))}
+
+
+def _ops_get(path):
+    # İşletim endpoint'leri; sunucuda OPS_TOKEN ayarlıysa aynı değer burada da verilmelidir
+    token = os.getenv('OPS_TOKEN')
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    return lambda ctx, i: {'method': 'GET', 'path': path, 'headers': headers}
+
+
+def _report(report_type, **extra):
+    return lambda ctx, i: {'method': 'POST', 'path': '/generate_report', 'headers': _headers(ctx.user(i)),
+                           'json': {'report_type': report_type, 'email': ctx.user(i), **extra}}
+
+
+def _import_body(ctx, i):
+    rows = ['category,amount,date'] + [f'Bench,{10 + row % 90}.5,2024-01-{1 + row % 28:02d}' for row in range(100)]
+    return {'method': 'POST', 'path': '/spending-log/import', 'params': {'format': 'csv'},
+            'headers': dict(_headers(ctx.user(i)), **{'Content-Type': 'text/csv'}),
+            'data': '\n'.join(rows).encode('utf-8')}
+
+
+def _card(ctx, i, method, **fields):
+    return {'method': method, 'path': '/credit-card', 'headers': _headers(ctx.user(i)),
+            'json': {'email': ctx.user(i), 'bank_name': f'Bench {ctx.run_id} {i}', **fields}}
+
+
+def _bill(ctx, i, method, **fields):
+    return {'method': method, 'path': '/bill', 'headers': _headers(ctx.user(i)),
+            'json': {'email': ctx.user(i), 'bill_name': f'Bench {ctx.run_id} {i}', **fields}}
+
+
+# Bir istekte bağımsız sorguları paralel çalıştıran (run_concurrently) endpoint'ler
+FANOUT_SCENARIOS = ['GET /upcoming-payments', 'GET /payments', 'POST /generate_report monthly_balance']
+
+# Senaryolar bu sırayla çalışır: önce okumalar, sonra oluşturma/güncelleme, en son silmeler.
+# Aynı i değeri POST/PUT/DELETE senaryolarında aynı kullanıcı ve kaydı hedefler.
+# default=False olanlar dış servis (kur API'si, SMTP) veya tüm kullanıcıları tarayan işler gerektirir.
+SCENARIOS = [
+    {'name': 'GET /budget', 'build': _get('/budget')},
+    {'name': 'GET /unpaid-bills', 'build': _get('/unpaid-bills')},
+    {'name': 'GET /unpaid-cards', 'build': _get('/unpaid-cards')},
+    {'name': 'GET /spending-summary', 'build': _get('/spending-summary')},
+    {'name': 'GET /recent-expenses', 'build': _get('/recent-expenses')},
+    {'name': 'GET /upcoming-payments', 'build': _get('/upcoming-payments')},
+    {'name': 'GET /payments', 'build': _get('/payments')},
+    {'name': 'GET /home/messages', 'build': _get('/home/messages')},
+    {'name': 'GET /export ndjson', 'build': _get('/export', format='ndjson')},
+    {'name': 'GET /metrics', 'build': _ops_get('/metrics')},
+    {'name': 'GET /report-cache/stats', 'build': _ops_get('/report-cache/stats')},
+    {'name': 'GET /password-hasher/stats', 'build': _ops_get('/password-hasher/stats')},
+    {'name': 'GET /scheduler/status', 'build': _ops_get('/scheduler/status')},
+    {'name': 'GET /kur', 'build': _get('/kur'), 'default': False},
+    {'name': 'POST /generate_report monthly_balance', 'build': _report('monthly_balance')},
+    {'name': 'POST /generate_report category_spending', 'build': _report('category_spending')},
+    {'name': 'POST /generate_report cash_flow_forecast', 'build': _report('cash_flow_forecast', months=3)},
+    {'name': 'POST /login', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/login', 'json': {'email': ctx.user(i), 'password': population.PASSWORD}}},
+    {'name': 'POST /register', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/register',
+        'json': {'username': f'new{i}', 'email': f'new-{ctx.run_id}-{i}@bench.local', 'password': 'secret'}}},
+    {'name': 'POST /budget', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/budget', 'json': {'email': ctx.user(i), 'initial_budget': 40000 + i % 1000}}},
+    {'name': 'POST /spending-log', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/spending-log', 'headers': _headers(ctx.user(i)),
+        'json': {'category': 'Bench', 'amount': 25.5}}},
+    {'name': 'POST /spending-log/import', 'build': _import_body},
+    {'name': 'POST /credit-card', 'build': lambda ctx, i: _card(
+        ctx, i, 'POST', card_limit=10000, due_date_start='2024-01-01', due_date_end='2024-01-10',
+        current_balance=1000)},
+    {'name': 'POST /bill', 'build': lambda ctx, i: _bill(
+        ctx, i, 'POST', amount=300, category='Elektrik', start_date='2024-01-01', end_date='2024-01-20',
+        is_paid=False)},
+    {'name': 'POST /make-payment', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/make-payment', 'headers': _headers(ctx.user(i)),
+        'json': {'email': ctx.user(i), 'odeme_turu': 'card', 'isim': f'Bench {ctx.run_id} {i}',
+                 'odeme_tutari': 1}}},
+    {'name': 'PUT /credit-card', 'build': lambda ctx, i: _card(ctx, i, 'PUT', current_balance=500)},
+    {'name': 'PUT /bill', 'build': lambda ctx, i: _bill(ctx, i, 'PUT', amount=350)},
+    {'name': 'POST /test-mail', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/test-mail', 'json': {'email': ctx.user(i)}}, 'default': False},
+    {'name': 'POST /run-daily-checks', 'build': lambda ctx, i: {
+        'method': 'POST', 'path': '/run-daily-checks'}, 'default': False},
+    {'name': 'DELETE /credit-card', 'build': lambda ctx, i: _card(ctx, i, 'DELETE')},
+    {'name': 'DELETE /bill', 'build': lambda ctx, i: _bill(ctx, i, 'DELETE')},
+    {'name': 'DELETE /spending-log', 'build': lambda ctx, i: {
+        'method': 'DELETE', 'path': '/spending-log', 'headers': _headers(ctx.user(i)),
+        'json': {'category': 'Bench'}}},
+]
+
+
+def in_process_sender():
+    """Uygulamayı bu süreçte oluşturur; her thread kendi test istemcisini kullanır"""
+    from app import create_app
+    application = create_app({'BACKGROUND_SERVICES': False})
+    local = threading.local()
+
+    def send(req):
+        if not hasattr(local, 'client'):
+            local.client = application.test_client()
+        response = local.client.open(req['path'], method=req['method'], query_string=req.get('params'),
+                                     headers=req.get('headers'), json=req.get('json'), data=req.get('data'))
+        response.get_data()
+        response.close()
+        return response.status_code
+
+    return send, application
+
+
+def http_sender(base_url, timeout=60):
+    """Çalışan bir sunucuya (WSGI veya ASGI) HTTP üzerinden istek gönderir"""
+    import requests
+    local = threading.local()
+
+    def send(req):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        response = local.session.request(req['method'], base_url + req['path'], params=req.get('params'),
+                                         headers=req.get('headers'), json=req.get('json'),
+                                         data=req.get('data'), timeout=timeout)
+        return response.status_code
+
+    return send
+
+
+def run_scenario(send, scenario, ctx, concurrency, total_requests, offset):
+    """Senaryoyu eşzamanlı çalıştırır; gecikme yüzdelikleri ve durum kodu dağılımını döndürür"""
+    latencies = []
+    statuses = {}
+    errors = 0
+    lock = threading.Lock()
+
+    def one_request(i):
+        nonlocal errors
+        req = scenario['build'](ctx, offset + i)
+        started = time.perf_counter()
+        try:
+            status = send(req)
+        except Exception:
+            status = None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if status is not None and status < 500:
+                latencies.append(elapsed_ms)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one_request, range(total_requests)))
+    summary = summarize(latencies, errors, time.perf_counter() - started)
+    summary['status_codes'] = statuses
+    return summary
+
+
+def compare_fanout(send, scenarios, ctx, levels, total_requests, offset):
+    """Fan-out endpoint'lerini paralel ve sıralı sorgularla ölçer (yalnızca uygulama bu süreçteyken)"""
+    import extensions
+    results = {}
+    for scenario in scenarios:
+        results[scenario['name']] = {}
+        for level, concurrency in enumerate(levels):
+            modes = {}
+            for index, (mode, enabled) in enumerate([('fanout', True), ('serial', False)]):
+                extensions.QUERY_FANOUT = enabled
+                modes[mode] = run_scenario(send, scenario, ctx, concurrency, total_requests,
+                                           offset + (level * 2 + index) * total_requests)
+            extensions.QUERY_FANOUT = True
+            results[scenario['name']][str(concurrency)] = modes
+            print(f"{scenario['name']} c={concurrency}: "
+                  f"fan-out p50={modes['fanout']['p50_ms']} p95={modes['fanout']['p95_ms']} "
+                  f"{modes['fanout']['throughput_rps']:.1f} req/s, "
+                  f"serial p50={modes['serial']['p50_ms']} p95={modes['serial']['p95_ms']} "
+                  f"{modes['serial']['throughput_rps']:.1f} req/s")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(baseline, results):
+    """İki sonuç dosyası arasındaki p95 farklarını yazdırır"""
+    for route, levels in results['routes'].items():
+        for concurrency, summary in levels.items():
+            before = baseline.get('routes', {}).get(route, {}).get(concurrency)
+            if not before or not before.get('p95_ms') or summary.get('p95_ms') is None:
+                continue
+            change = (summary['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            print(f"{route} c={concurrency}: p95 {before['p95_ms']:.1f} -> {summary['p95_ms']:.1f} ms "
+                  f"({change:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sentetik veriyle tüm endpoint\'lerin verim ve gecikme (p50/p95/p99) ölçümü')
+    parser.add_argument('--mongodb-uri', default=os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+    parser.add_argument('--database', default=DEFAULT_DATABASE,
+                        help='Benchmark veritabanı (uygulamanın veritabanı kullanılmamalı)')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--logs-per-user', type=int, default=200, help='Kullanıcı başına medyan harcama sayısı')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-seed', action='store_true', help='Mevcut veriyi kullan')
+    parser.add_argument('--drop', action='store_true', help='Tohumlamadan önce benchmark veritabanını sil')
+    parser.add_argument('--url', help='Çalışan sunucu adresi; verilmezse uygulama bu süreçte çalışır')
+    parser.add_argument('--routes', nargs='*', help='Yalnızca bu senaryolar (ör. "GET /budget")')
+    parser.add_argument('--all-routes', action='store_true', help='Dış servis gerektiren senaryoları da çalıştır')
+    parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=200, help='Senaryo ve eşzamanlılık başına istek')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--baseline', help='Karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--compare-fanout', action='store_true',
+                        help='Fan-out endpoint\'lerini paralel ve sıralı sorgularla karşılaştır')
+    args = parser.parse_args()
+    if args.compare_fanout and args.url:
+        parser.error('--compare-fanout needs the in-process app; for a server, run once with '
+                     'QUERY_FANOUT=False and compare with --baseline')
+
+    # Uygulama (bu süreçte çalışıyorsa) aynı veritabanını kullanmalı; fan-out havuzu en yüksek
+    # eşzamanlılığa göre boyutlanır (sunucudaki SERVER_THREADS karşılığı)
+    os.environ['MONGODB_URI'] = args.mongodb_uri
+    os.environ['MONGODB_DATABASE'] = args.database
+    os.environ.setdefault('SERVER_THREADS', str(max(args.concurrency)))
+
+    from pymongo import MongoClient
+    db = MongoClient(args.mongodb_uri)[args.database]
+    seed_info = None
+    if not args.skip_seed:
+        if args.drop:
+            population.drop(db)
+        started = time.perf_counter()
+        counts = population.seed(db, args.users, args.logs_per_user, args.seed,
+                                 rounds=int(os.getenv('BCRYPT_ROUNDS', 12)))
+        seed_info = {'documents': counts, 'seconds': round(time.perf_counter() - started, 2)}
+        print(f"Seeded {counts} in {seed_info['seconds']}s")
+
+    if args.url:
+        send = http_sender(args.url.rstrip('/'))
+    else:
+        send, application = in_process_sender()
+        covered = {scenario['name'].split()[1] for scenario in SCENARIOS}
+        missing = sorted({rule.rule for rule in application.url_map.iter_rules()
+                          if not rule.rule.startswith('/static')} - covered)
+        if missing:
+            print(f"Warning: routes without a benchmark scenario: {', '.join(missing)}")
+
+    if args.compare_fanout:
+        scenarios = [scenario for scenario in SCENARIOS
+                     if scenario['name'] in (args.routes or FANOUT_SCENARIOS)]
+    else:
+        scenarios = [scenario for scenario in SCENARIOS
+                     if (args.routes and scenario['name'] in args.routes)
+                     or (not args.routes and (args.all_routes or scenario.get('default', True)))]
+
+    ctx = Context(args.users, uuid.uuid4().hex[:8])
+    results = {
+        'commit': _git_commit(),
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'target': args.url or 'in-process',
+        'population': {'users': args.users, 'logs_per_user': args.logs_per_user, 'seed': args.seed},
+        'seed': seed_info,
+        'requests': args.requests,
+        'routes': {}
+    }
+    if args.compare_fanout:
+        results['fanout'] = compare_fanout(send, scenarios, ctx, args.concurrency, args.requests, 0)
+        scenarios = []
+    for scenario in scenarios:
+        results['routes'][scenario['name']] = {}
+        for level, concurrency in enumerate(args.concurrency):
+            summary = run_scenario(send, scenario, ctx, concurrency, args.requests, level * args.requests)
+            results['routes'][scenario['name']][str(concurrency)] = summary
+            print(f"{scenario['name']} c={concurrency}: {summary['throughput_rps']:.1f} req/s "
+                  f"p50={summary['p50_ms']} p95={summary['p95_ms']} p99={summary['p99_ms']} "
+                  f"status={summary['status_codes']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
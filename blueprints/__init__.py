@@ -0,0 +1,10 @@
+from blueprints.accounts import bp as accounts
+from blueprints.budget import bp as budget
+from blueprints.cards import bp as cards
+from blueprints.bills import bp as bills
+from blueprints.spending import bp as spending
+from blueprints.reports import bp as reports
+from blueprints.dashboard import bp as dashboard
+from blueprints.admin import bp as admin
+
+BLUEPRINTS = [accounts, budget, cards, bills, spending, reports, dashboard, admin]
@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify
+from passwords import HasherBusy
+from extensions import users, password_hasher
+
+bp = Blueprint('accounts', __name__)
+
+
+@bp.route('/register', methods=['POST'])
+def register():
+    data = request.get_json()
+    
+    # Check if user already exists
+    if users.find_one({'email': data['email']}):
+        return jsonify({'error': 'Email already exists'}), 400
+    
+    # Hash password
+    try:
+        hashed_password = password_hasher.hash(data['password'])
+    except HasherBusy:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
+    
+    # Create new user
+    user = {
+        'username': data['username'],
+        'email': data['email'],
+        'password': hashed_password
+    }
+    
+    users.insert_one(user)
+    return jsonify({'message': 'User registered successfully'}), 201
+
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.get_json()
+    
+    # Find user by email
+    user = users.find_one({'email': data['email']})
+    
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Check password
+    try:
+        password_matches = password_hasher.check(data['password'], user['password'])
+    except HasherBusy:
+        return jsonify({'error': 'Server is busy, please try again'}), 503
+    
+    if password_matches:
+        # Rehash transparently if the configured work factor has changed
+        if password_hasher.needs_rehash(user['password']):
+            password_hasher.rehash_in_background(
+                data['password'],
+                lambda new_hash: users.update_one(
+                    {'_id': user['_id'], 'password': user['password']},
+                    {'$set': {'password': new_hash}}
+                )
+            )
+        return jsonify({
+            'message': 'Login successful',
+            'user': {
+                'username': user['username'],
+                'email': user['email']
+            }
+        }), 200
+    else:
+        return jsonify({'error': 'Invalid password'}), 401
@@ -0,0 +1,190 @@
+import datetime
+import hmac
+import os
+from functools import wraps
+import click
+from flask import Blueprint, current_app, request, jsonify, Response
+from email_templates import create_bill_reminder
+from export import stream_export, EXPORT_FORMATS
+from indexes import ensure_indexes, audit_query_plans
+from rollups import rebuild_rollups, verify_rollups
+from spending_storage import STORAGE_COLLECTIONS, STORAGE_MODE, migrate as migrate_spending, storage_stats
+from mongo_config import WORKLOADS, client_options
+import metrics
+from extensions import (spending_logs, spending_totals, bills, budgets, report_cache, password_hasher, data_versions,
+                        get_client, get_db)
+from jobs import (send_email_notification, check_and_send_bill_reminders, check_and_send_budget_alerts,
+                  scheduler_status, backfill_shard_keys, FORECAST_BATCH_MONTHS)
+
+# İşletim endpoint'leri ve CLI komutları (flask --app app <komut>)
+bp = Blueprint('admin', __name__, cli_group=None)
+
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+
+def ops_only(view):
+    """İç durum bilgisi döndüren endpoint'leri korur: OPS_TOKEN ayarlıysa 'Authorization: Bearer <token>'
+    ister, ayarlı değilse yalnızca loopback adresinden gelen isteklere izin verir"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = current_app.config['OPS_TOKEN']
+        if token:
+            supplied = request.headers.get('Authorization', '')
+            if not hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+                return jsonify({'error': 'Unauthorized'}), 401
+        elif request.remote_addr not in LOOPBACK_ADDRESSES:
+            return jsonify({'error': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@bp.route('/metrics', methods=['GET'])
+@ops_only
+def get_metrics():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+@bp.route('/report-cache/stats', methods=['GET'])
+@ops_only
+def get_report_cache_stats():
+    return jsonify(report_cache.stats()), 200
+
+@bp.route('/password-hasher/stats', methods=['GET'])
+@ops_only
+def get_password_hasher_stats():
+    return jsonify(password_hasher.stats()), 200
+
+@bp.route('/scheduler/status', methods=['GET'])
+@ops_only
+def get_scheduler_status():
+    status = scheduler_status()
+    if status is None:
+        return jsonify({'error': 'Scheduler is not running in this process'}), 404
+    return jsonify(status), 200
+
+@bp.route('/run-daily-checks', methods=['POST'])
+def run_daily_checks():
+    try:
+        bill_reminders = check_and_send_bill_reminders()
+        budget_alerts = check_and_send_budget_alerts()
+        return jsonify({
+            'message': 'Daily checks completed successfully',
+            'bill_reminders': bill_reminders,
+            'budget_alerts': budget_alerts
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/test-mail', methods=['POST'])
+def test_mail():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data:
+        return jsonify({'error': 'Email is required'}), 400
+    
+    # Create a test bill reminder
+    message = create_bill_reminder(
+        data['email'],
+        "Test Fatura",
+        100.00,
+        datetime.datetime.now().strftime('%Y-%m-%d')
+    )
+    
+    if send_email_notification(message):
+        return jsonify({'message': 'Test email queued successfully'}), 200
+    else:
+        return jsonify({'error': 'Failed to send test email'}), 500
+
+@bp.cli.command('ensure-indexes')
+def ensure_indexes_command():
+    """Tüm koleksiyonların index'lerini oluşturur"""
+    failed = ensure_indexes(get_db())
+    if failed:
+        raise SystemExit(1)
+    print("All indexes are in place")
+
+@bp.cli.command('audit-indexes')
+def audit_indexes_command():
+    """Endpoint sorgularının planlarını kontrol eder, COLLSCAN varsa hata verir"""
+    collscans = audit_query_plans(get_db())
+    for name, collection_name in collscans:
+        print(f"COLLSCAN: {name} ({collection_name})")
+    if collscans:
+        raise SystemExit(1)
+    print("All query shapes use an index")
+
+@bp.cli.command('export-user')
+@click.option('--email', required=True, help='User whose records are exported')
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='ndjson')
+@click.option('--output', type=click.File('wb'), default='-', help='Output file (default: stdout)')
+def export_user_command(email, fmt, output):
+    """Kullanıcının harcama, fatura ve kart kayıtlarını dışa aktarır"""
+    for chunk in stream_export(get_db(), email, fmt, batch_size=int(os.getenv('EXPORT_BATCH_SIZE', 1000))):
+        output.write(chunk)
+
+@bp.cli.command('forecast-all')
+@click.option('--months', type=int, default=FORECAST_BATCH_MONTHS, help='Forecast horizon in months')
+def forecast_all_command(months):
+    """Tüm kullanıcılar için nakit akışı tahmini üretir (cash_flow_forecasts)"""
+    from forecast import forecast_all_users
+    count = forecast_all_users(get_db('jobs'), months)
+    print(f"Forecasted {count} users")
+
+@bp.cli.command('rebuild-rollups')
+@click.option('--email', default=None, help='Only rebuild totals for this user')
+def rebuild_rollups_command(email):
+    """Harcama toplamlarını ham kayıtlardan yeniden oluşturur"""
+    count = rebuild_rollups(spending_totals, spending_logs, email)
+    # /budget ve /spending-summary toplamları değişmiş olabilir
+    if email:
+        data_versions.bump(email)
+    else:
+        data_versions.bump_all()
+    print(f"Rebuilt {count} spending totals")
+
+@bp.cli.command('verify-rollups')
+@click.option('--email', default=None, help='Only verify totals for this user')
+def verify_rollups_command(email):
+    """Harcama toplamlarını ham kayıtlarla karşılaştırır, fark varsa hata verir"""
+    mismatches = verify_rollups(spending_totals, spending_logs, email)
+    for mismatch in mismatches:
+        print(f"Drift: {mismatch['key']} expected={mismatch['expected']} stored={mismatch['stored']}")
+    if mismatches:
+        raise SystemExit(1)
+    print("Spending totals match raw logs")
+
+@bp.cli.command('migrate-spending-logs')
+@click.option('--to', 'target', type=click.Choice(list(STORAGE_COLLECTIONS)), default='timeseries',
+              help='Target storage mode')
+@click.option('--batch-size', type=int, default=5000)
+@click.option('--no-resume', is_flag=True, help='Ignore saved progress and copy from the beginning; already copied logs are skipped')
+def migrate_spending_logs_command(target, batch_size, no_resume):
+    """Harcama kayıtlarını diğer saklama modundan hedef moda kopyalar (kaynak silinmez)"""
+    db = get_db()
+    copied = migrate_spending(db, target, batch_size, resume=not no_resume)
+    print(f"Copied {copied} spending logs into {STORAGE_COLLECTIONS[target]}")
+    for name in STORAGE_COLLECTIONS.values():
+        if name in db.list_collection_names(filter={'name': name}):
+            stats = storage_stats(db, name)
+            print(f"{name}: {stats['documents']} logs, storage {stats['storage_bytes']} bytes, "
+                  f"indexes {stats['index_bytes']} bytes")
+    if target != STORAGE_MODE:
+        print(f"Set SPENDING_STORAGE={target} and restart, then run this command again to copy "
+              f"logs written in between, and verify with verify-rollups")
+
+@bp.cli.command('backfill-shard-keys')
+def backfill_shard_keys_command():
+    """shard_key alanı olmayan fatura ve bütçe belgelerine zamanlayıcı parça anahtarını yazar"""
+    print(f"Updated {backfill_shard_keys(bills)} bills, {backfill_shard_keys(budgets)} budgets")
+
+@bp.cli.command('mongo-routing')
+def mongo_routing_command():
+    """Bağlantı ayarlarını ve her iş yükünün okumalarının hangi sunucuya gittiğini gösterir"""
+    client = get_client()
+    print(f"Client options: {client_options() or 'driver defaults'}")
+    print(f"Primary: {client.primary}, secondaries: {sorted(client.secondaries)}")
+    for workload in (None,) + WORKLOADS:
+        db = get_db(workload)
+        cursor = db.users.find({}, {'_id': 1}).limit(1)
+        list(cursor)
+        print(f"{workload or 'default'}: {db.read_preference.document} -> {cursor.address}")
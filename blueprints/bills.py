@@ -0,0 +1,128 @@
+from flask import Blueprint, request, jsonify
+from pagination import InvalidCursor, ASCENDING
+from extensions import users, bills, report_cache, data_versions
+from leader import shard_key
+from blueprints.common import paginate_fields, conditional
+
+bp = Blueprint('bills', __name__)
+
+BILL_FIELDS = ['email', 'bill_name', 'amount', 'category', 'start_date', 'end_date', 'is_paid',
+               'is_notification_enabled', 'last_notification_date']
+
+
+@bp.route('/bill', methods=['POST'])
+def add_bill():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    required_fields = ['email', 'bill_name', 'amount', 'category', 'start_date', 'end_date', 'is_paid']
+    if not data or not all(field in data for field in required_fields):
+        return jsonify({'error': 'All fields are required: email, bill_name, amount, category, start_date, end_date, is_paid'}), 400
+    
+    # Check if user exists
+    user = users.find_one({'email': data['email']})
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Create new bill with notification settings
+    bill = {
+        'email': data['email'],
+        'bill_name': data['bill_name'],
+        'amount': data['amount'],
+        'category': data['category'],
+        'start_date': data['start_date'],
+        'end_date': data['end_date'],
+        'is_paid': data['is_paid'],
+        'is_notification_enabled': data.get('is_notification_enabled', True),  # Default to True
+        'last_notification_date': None,  # Track when the last notification was sent
+        'shard_key': shard_key(data['email'])  # Scheduler shard of the reminder job
+    }
+    
+    bills.insert_one(bill)
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Bill added successfully'}), 201
+
+@bp.route('/bill', methods=['PUT'])
+def update_bill():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data or 'bill_name' not in data:
+        return jsonify({'error': 'Email and bill_name are required'}), 400
+    
+    # Check if bill exists
+    existing_bill = bills.find_one({
+        'email': data['email'],
+        'bill_name': data['bill_name']
+    })
+    
+    if not existing_bill:
+        return jsonify({'error': 'Bill not found'}), 404
+    
+    # Update fields
+    update_data = {}
+    if 'amount' in data:
+        update_data['amount'] = data['amount']
+    if 'category' in data:
+        update_data['category'] = data['category']
+    if 'start_date' in data:
+        update_data['start_date'] = data['start_date']
+    if 'end_date' in data:
+        update_data['end_date'] = data['end_date']
+    if 'is_paid' in data:
+        update_data['is_paid'] = data['is_paid']
+    if 'is_notification_enabled' in data:
+        update_data['is_notification_enabled'] = data['is_notification_enabled']
+    
+    bills.update_one(
+        {'email': data['email'], 'bill_name': data['bill_name']},
+        {'$set': update_data}
+    )
+    
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Bill updated successfully'}), 200
+
+@bp.route('/bill', methods=['DELETE'])
+def delete_bill():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data or 'bill_name' not in data:
+        return jsonify({'error': 'Email and bill_name are required'}), 400
+    
+    # Delete bill
+    result = bills.delete_one({
+        'email': data['email'],
+        'bill_name': data['bill_name']
+    })
+    
+    if result.deleted_count == 0:
+        return jsonify({'error': 'Bill not found'}), 404
+    
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Bill deleted successfully'}), 200
+
+@bp.route('/unpaid-bills', methods=['GET'])
+@conditional
+def get_unpaid_bills():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Find unpaid bills for the user, one page at a time ordered by due date
+    try:
+        unpaid_bills, next_cursor = paginate_fields(
+            bills, {'email': user_email, 'is_paid': False}, BILL_FIELDS, 'end_date', ASCENDING
+        )
+    except (InvalidCursor, ValueError):
+        return jsonify({'error': 'Invalid cursor or limit'}), 400
+    
+    return jsonify({'unpaid_bills': unpaid_bills, 'next_cursor': next_cursor}), 200
@@ -0,0 +1,130 @@
+import math
+from flask import Blueprint, request, jsonify
+from email_templates import create_payment_notification
+from payments import make_payment as apply_payment, parse_amount, PaymentError
+from rollups import get_user_total
+from extensions import (users, budgets, spending_totals, report_cache, data_versions, get_client, get_db,
+                        transactions_supported)
+from jobs import send_email_notification
+from leader import shard_key
+from blueprints.common import conditional
+
+bp = Blueprint('budget', __name__)
+
+
+@bp.route('/budget', methods=['POST'])
+def set_budget():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data or 'initial_budget' not in data:
+        return jsonify({'error': 'Email and initial_budget are required'}), 400
+    
+    # Optional per-user low budget alert threshold (null resets it to the default)
+    update_data = {'initial_budget': data['initial_budget'], 'shard_key': shard_key(data['email'])}
+    if 'alert_threshold' in data:
+        threshold = data['alert_threshold']
+        if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, (int, float))
+                                      or not math.isfinite(threshold) or threshold < 0):
+            return jsonify({'error': 'alert_threshold must be a non-negative number'}), 400
+        update_data['alert_threshold'] = threshold
+    
+    # Check if user exists
+    user = users.find_one({'email': data['email']})
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Check if budget already exists for the user
+    existing_budget = budgets.find_one({'email': data['email']})
+    
+    if existing_budget:
+        # Update existing budget and re-arm the low budget alert
+        budgets.update_one(
+            {'email': data['email']},
+            {'$set': update_data, '$unset': {'low_budget_alerted_at': ''}}
+        )
+        report_cache.invalidate(data['email'], 'monthly_balance')
+        data_versions.bump(data['email'])
+        return jsonify({'message': 'Budget updated successfully'}), 200
+    else:
+        # Create new budget
+        budget = {
+            'email': data['email'],
+            **update_data
+        }
+        budgets.insert_one(budget)
+        report_cache.invalidate(data['email'], 'monthly_balance')
+        data_versions.bump(data['email'])
+        return jsonify({'message': 'Budget created successfully'}), 201
+
+@bp.route('/budget', methods=['GET'])
+@conditional
+def get_budget():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Find user's budget
+    budget = budgets.find_one({'email': user_email})
+    
+    if not budget:
+        return jsonify({
+            'initial_budget': 0,
+            'remaining_amount': 0
+        }), 200
+    
+    # Calculate remaining amount from the running spending total
+    total_spent = get_user_total(spending_totals, user_email)
+    
+    remaining_amount = float(budget['initial_budget']) - total_spent
+    
+    return jsonify({
+        'initial_budget': float(budget['initial_budget']),
+        'remaining_amount': remaining_amount
+    }), 200
+
+@bp.route('/make-payment', methods=['POST'])
+def make_payment():
+    data = request.get_json()
+    
+    # Check required fields
+    required_fields = ['email', 'odeme_turu', 'isim', 'odeme_tutari']
+    if not data or not all(field in data for field in required_fields):
+        return jsonify({'error': 'All fields are required: email, odeme_turu, isim, odeme_tutari'}), 400
+    
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Bütçe ve fatura/kart koşullu atomik güncellemelerle birlikte değişir;
+    # eşzamanlı iki ödeme bütçeyi aşamaz
+    try:
+        amount = parse_amount(data['odeme_tutari'])
+        new_budget = apply_payment(
+            get_client(), get_db(), user_email, data['odeme_turu'], data['isim'], amount,
+            use_transactions=transactions_supported()
+        )
+    except PaymentError as e:
+        return jsonify({'error': e.message}), e.status
+    
+    report_cache.invalidate(user_email, 'monthly_balance')
+    data_versions.bump(user_email)
+    
+    # Send payment notification email
+    message = create_payment_notification(
+        user_email,
+        data['odeme_turu'],
+        data['isim'],
+        data['odeme_tutari'],
+        new_budget
+    )
+    send_email_notification(message)
+    
+    return jsonify({
+        'message': 'Payment successful',
+        'remaining_budget': new_budget
+    }), 200
@@ -0,0 +1,118 @@
+from flask import Blueprint, request, jsonify
+from pagination import InvalidCursor, ASCENDING
+from extensions import users, credit_cards, report_cache, data_versions
+from blueprints.common import paginate_fields, conditional
+
+bp = Blueprint('cards', __name__)
+
+CARD_FIELDS = ['email', 'bank_name', 'card_limit', 'due_date_start', 'due_date_end', 'current_balance']
+
+
+@bp.route('/credit-card', methods=['POST'])
+def add_credit_card():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    required_fields = ['email', 'bank_name', 'card_limit', 'due_date_start', 'due_date_end', 'current_balance']
+    if not data or not all(field in data for field in required_fields):
+        return jsonify({'error': 'All fields are required: email, bank_name, card_limit, due_date_start, due_date_end, current_balance'}), 400
+    
+    # Check if user exists
+    user = users.find_one({'email': data['email']})
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Create new credit card
+    credit_card = {
+        'email': data['email'],
+        'bank_name': data['bank_name'],
+        'card_limit': data['card_limit'],
+        'due_date_start': data['due_date_start'],
+        'due_date_end': data['due_date_end'],
+        'current_balance': data['current_balance']
+    }
+    
+    credit_cards.insert_one(credit_card)
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Credit card added successfully'}), 201
+
+@bp.route('/credit-card', methods=['PUT'])
+def update_credit_card():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data or 'bank_name' not in data:
+        return jsonify({'error': 'Email and bank_name are required'}), 400
+    
+    # Check if credit card exists
+    existing_card = credit_cards.find_one({
+        'email': data['email'],
+        'bank_name': data['bank_name']
+    })
+    
+    if not existing_card:
+        return jsonify({'error': 'Credit card not found'}), 404
+    
+    # Update fields
+    update_data = {}
+    if 'card_limit' in data:
+        update_data['card_limit'] = data['card_limit']
+    if 'due_date_start' in data:
+        update_data['due_date_start'] = data['due_date_start']
+    if 'due_date_end' in data:
+        update_data['due_date_end'] = data['due_date_end']
+    if 'current_balance' in data:
+        update_data['current_balance'] = data['current_balance']
+    
+    credit_cards.update_one(
+        {'email': data['email'], 'bank_name': data['bank_name']},
+        {'$set': update_data}
+    )
+    
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Credit card updated successfully'}), 200
+
+@bp.route('/credit-card', methods=['DELETE'])
+def delete_credit_card():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'email' not in data or 'bank_name' not in data:
+        return jsonify({'error': 'Email and bank_name are required'}), 400
+    
+    # Delete credit card
+    result = credit_cards.delete_one({
+        'email': data['email'],
+        'bank_name': data['bank_name']
+    })
+    
+    if result.deleted_count == 0:
+        return jsonify({'error': 'Credit card not found'}), 404
+    
+    report_cache.invalidate(data['email'], 'monthly_balance')
+    data_versions.bump(data['email'])
+    
+    return jsonify({'message': 'Credit card deleted successfully'}), 200
+
+@bp.route('/unpaid-cards', methods=['GET'])
+@conditional
+def get_unpaid_cards():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Find credit cards for the user, one page at a time ordered by due date
+    try:
+        user_cards, next_cursor = paginate_fields(
+            credit_cards, {'email': user_email}, CARD_FIELDS, 'due_date_end', ASCENDING
+        )
+    except (InvalidCursor, ValueError):
+        return jsonify({'error': 'Invalid cursor or limit'}), 400
+    
+    return jsonify({'credit_cards': user_cards, 'next_cursor': next_cursor}), 200
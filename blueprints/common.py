@@ -0,0 +1,55 @@
+import os
+from functools import wraps
+from flask import current_app, make_response, request
+from pagination import paginate
+from extensions import data_versions
+
+# Liste endpoint'leri için sayfa boyutu sınırları
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 100))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 500))
+
+
+def get_page_size(default=DEFAULT_PAGE_SIZE):
+    """İstekteki limit parametresini okur ve izin verilen aralığa sınırlar"""
+    limit = int(request.args.get('limit', default))
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate_fields(collection, query, fields, sort_field, direction, default_page_size=None):
+    """Yalnızca istenen alanları sayfalar; _id sadece devam anahtarı için okunur.
+    default_page_size None ise limit ve cursor gönderilmeyen isteklerde tüm kayıtlar döner."""
+    if default_page_size is None and 'limit' not in request.args and 'cursor' not in request.args:
+        page_size = None
+    else:
+        page_size = get_page_size(default_page_size or DEFAULT_PAGE_SIZE)
+    docs, next_cursor = paginate(
+        collection, query, {field: 1 for field in fields},
+        sort_field, direction, page_size, request.args.get('cursor')
+    )
+    return [{field: doc[field] for field in fields if field in doc} for doc in docs], next_cursor
+
+
+def conditional(view):
+    """Yanıta kullanıcının veri sürümünü ETag olarak ekler.
+    If-None-Match eşleşirse endpoint (ve sorguları) çalıştırılmadan 304 döner."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_email = request.headers.get('X-User-Email')
+        if not user_email:
+            return view(*args, **kwargs)
+
+        # Sürüm, veriden önce okunur; araya giren bir yazma en fazla gereksiz bir tam yanıta yol açar
+        etag = data_versions.etag(user_email)
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        # Sıkıştırma gövdeyi değiştirdiğinden zayıf ETag; tarayıcı saklar ama her seferinde doğrular
+        response.set_etag(etag, weak=True)
+        response.vary.add('X-User-Email')
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
@@ -0,0 +1,182 @@
+import datetime
+from flask import Blueprint, request, jsonify
+from extensions import LazyCollection, credit_cards, bills, rate_provider, run_concurrently
+from spending_storage import SPENDING_LOGS
+
+bp = Blueprint('dashboard', __name__)
+
+# Özet sorguları (/home/messages, /payments) MONGODB_SUMMARIES_READ_PREFERENCE ile okunur
+summary_budgets = LazyCollection('budgets', 'summaries')
+summary_credit_cards = LazyCollection('credit_cards', 'summaries')
+summary_bills = LazyCollection('bills', 'summaries')
+summary_spending_logs = LazyCollection(SPENDING_LOGS, 'summaries')
+
+
+# Anasayfa mesaj kuralları; yeni kural eklemek yeni sorgu gerektirmez.
+# type: total_budget_ratio -> aylık toplam >= bütçe * ratio
+#       category_budget_ratio -> kategori toplamı > bütçe * ratio
+#       top_category -> en çok harcanan kategori
+#       no_spending -> ay içinde hiç harcama yok
+HOME_MESSAGE_RULES = [
+    {'type': 'total_budget_ratio', 'ratio': 0.9,
+     'message': "💸 Kaynaklarınız tükenmek üzere, harcamalarınıza dikkat edin!"},
+    {'type': 'top_category', 'category': 'Eğitim',
+     'message': "🎓 Bu ay eğitim harcamalarınız diğer kategorilere göre daha yüksek."},
+    {'type': 'no_spending',
+     'message': "🔍 Henüz bir harcama girişi yapmadınız. Harcamalarınızı kaydedin."},
+    {'type': 'category_budget_ratio', 'category': 'Spor', 'ratio': 0.3,
+     'message': "🏋️ Bu ay spor harcamalarınız artmış görünüyor."},
+]
+
+HOME_MESSAGE_CHECKS = {
+    'total_budget_ratio': lambda rule, totals, budget: sum(totals.values()) >= budget * rule['ratio'],
+    'category_budget_ratio': lambda rule, totals, budget: totals.get(rule['category'], 0) > budget * rule['ratio'],
+    'top_category': lambda rule, totals, budget: bool(totals) and max(totals, key=totals.get) == rule['category'],
+    'no_spending': lambda rule, totals, budget: not totals,
+}
+
+def month_range(year, month):
+    """Ayın başlangıç ve bir sonraki ayın başlangıç tarihlerini döndürür"""
+    start = datetime.datetime(year, month, 1)
+    end = datetime.datetime(year + 1, 1, 1) if month == 12 else datetime.datetime(year, month + 1, 1)
+    return start, end
+
+# Sorgu ve yanıt biçimleri hem bu blueprint'te hem ASGI modunun async handler'larında (asgi.py) kullanılır
+
+def monthly_category_pipeline(user_email, year, month):
+    """Kullanıcının bir aydaki harcamalarını kategori bazında toplayan aggregation"""
+    start, end = month_range(year, month)
+    return [
+        {'$match': {'email': user_email, 'date': {'$gte': start, '$lt': end}}},
+        {'$group': {'_id': '$category', 'total': {'$sum': '$amount'}}}
+    ]
+
+def get_monthly_category_totals(user_email, year, month):
+    """Kullanıcının bir aydaki harcamalarını tek aggregation ile kategori bazında toplar"""
+    pipeline = monthly_category_pipeline(user_email, year, month)
+    return {item['_id']: item['total'] for item in summary_spending_logs.aggregate(pipeline)}
+
+def home_messages(totals, budget_amount):
+    """Kategori toplamlarına uyan anasayfa mesajları"""
+    return [
+        rule['message'] for rule in HOME_MESSAGE_RULES
+        if HOME_MESSAGE_CHECKS[rule['type']](rule, totals, budget_amount)
+    ]
+
+def upcoming_payment_queries(email, current_date):
+    """Önümüzdeki 30 günün kart ve fatura sorguları: ((filtre, projeksiyon), (filtre, projeksiyon))"""
+    thirty_days_later = current_date + datetime.timedelta(days=30)
+    date_range = {
+        '$gte': current_date.strftime('%Y-%m-%d'),
+        '$lte': thirty_days_later.strftime('%Y-%m-%d')
+    }
+    return (
+        ({'email': email, 'due_date_end': date_range}, {'bank_name': 1, 'current_balance': 1, 'due_date_end': 1}),
+        ({'email': email, 'is_paid': False, 'end_date': date_range}, {'bill_name': 1, 'amount': 1, 'end_date': 1})
+    )
+
+def merge_upcoming_payments(cards_list, bills_list):
+    """Kart ve fatura ödemelerini tek listede vade tarihine göre sıralar"""
+    card_payments = [{
+        'name': f"{card['bank_name']} Kredi Kartı",
+        'amount': card['current_balance'],
+        'due_date': card['due_date_end']
+    } for card in cards_list]
+    bill_payments = [{
+        'name': bill['bill_name'],
+        'amount': bill['amount'],
+        'due_date': bill['end_date']
+    } for bill in bills_list]
+    all_payments = card_payments + bill_payments
+    all_payments.sort(key=lambda x: x['due_date'])
+    return all_payments
+
+def sum_pipeline(match, field):
+    """Eşleşen belgelerde alanın toplamı (tek belge: {'_id': None, 'total': ...})"""
+    return [
+        {'$match': match},
+        {'$group': {'_id': None, 'total': {'$sum': {'$toDouble': f'${field}'}}}}
+    ]
+
+def paid_total_queries(user_email):
+    """/payments toplamları: ödenmiş faturalar ve kart bakiyeleri için (eşleşme, alan)"""
+    return ({'email': user_email, 'is_paid': True}, 'amount'), ({'email': user_email}, 'current_balance')
+
+@bp.route('/home/messages', methods=['GET'])
+def get_home_messages():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    # Get user's budget
+    user_budget = summary_budgets.find_one({'email': user_email})
+    if not user_budget:
+        return jsonify({'error': 'Budget not found'}), 404
+    
+    # Bu ayın kategori toplamları tüm kurallar için tek seferde hesaplanır
+    now = datetime.datetime.now()
+    totals = get_monthly_category_totals(user_email, now.year, now.month)
+    messages = home_messages(totals, user_budget['initial_budget'])
+    
+    return jsonify({'messages': messages}), 200
+
+@bp.route('/upcoming-payments', methods=['GET'])
+def get_upcoming_payments():
+    try:
+        email = request.headers.get('X-User-Email')
+        if not email:
+            return jsonify({'error': 'Kullanıcı bilgisi bulunamadı'}), 401
+
+        # Önümüzdeki 30 günün kredi kartı ve fatura ödemelerini aynı anda al
+        card_query, bill_query = upcoming_payment_queries(email, datetime.datetime.now())
+        cards_list, bills_list = run_concurrently(
+            lambda: list(credit_cards.find(*card_query)),
+            lambda: list(bills.find(*bill_query))
+        )
+
+        # Tüm ödemeleri birleştir ve tarihe göre sırala
+        return jsonify({'payments': merge_upcoming_payments(cards_list, bills_list)}), 200
+    except Exception as e:
+        print(f"Error in get_upcoming_payments: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/payments', methods=['GET'])
+def get_payments():
+    try:
+        # Get user email from header
+        user_email = request.headers.get('X-User-Email')
+        
+        if not user_email:
+            return jsonify({'error': 'User not authenticated'}), 401
+        
+        # Sum paid bills and credit card balances in the database, both at once
+        def total(collection, match, field):
+            result = list(collection.aggregate(sum_pipeline(match, field)))
+            return result[0]['total'] if result else 0
+        
+        bill_query, card_query = paid_total_queries(user_email)
+        bill_total, card_total = run_concurrently(
+            lambda: total(summary_bills, *bill_query),
+            lambda: total(summary_credit_cards, *card_query)
+        )
+        total_payments = bill_total + card_total
+        
+        return jsonify({
+            'total_payments': total_payments
+        }), 200
+        
+    except Exception as e:
+        print(f"Error in get_payments: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route("/kur", methods=["GET"])
+def get_selected_exchange_rates():
+    try:
+        data = rate_provider.get()
+        selected = {k: v for k, v in data["rates"].items() if k in ["TRY", "EUR", "GBP"]}
+        return jsonify({
+            "base": data["base"],
+            "date": data["date"],
+            "rates": selected
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,247 @@
+import datetime
+from flask import Blueprint, request, jsonify
+from extensions import LazyCollection, users, report_cache, run_concurrently, get_db
+from spending_storage import SPENDING_LOGS
+
+bp = Blueprint('reports', __name__)
+
+# Rapor hesaplamaları MONGODB_REPORTS_READ_PREFERENCE ile (varsayılan secondary) okunur
+budgets = LazyCollection('budgets', 'reports')
+credit_cards = LazyCollection('credit_cards', 'reports')
+bills = LazyCollection('bills', 'reports')
+spending_logs = LazyCollection(SPENDING_LOGS, 'reports')
+
+FORECAST_MAX_MONTHS = 24
+
+
+MONTH_NAMES = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+               'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+
+REPORT_GRANULARITIES = ('month', 'week', 'day')
+# Tek raporda istenebilecek en fazla yıl sayısı (dönem sayısını sınırlar)
+REPORT_MAX_YEARS = {'month': 10, 'week': 5, 'day': 2}
+
+
+def _parse_int(value):
+    """Tam sayı veya tam sayı metni; diğer değerler için None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value) if isinstance(value, (int, str)) else None
+    except ValueError:
+        return None
+
+def _period_key_expression(date_field, granularity):
+    """'YYYY-MM-DD' metin tarih alanından dönem anahtarı üreten aggregation ifadesi"""
+    if granularity == 'month':
+        return {'$substrCP': [f'${date_field}', 0, 7]}
+    if granularity == 'day':
+        return {'$substrCP': [f'${date_field}', 0, 10]}
+    # Haftalık: ISO hafta (ör. 2024-W05)
+    return {'$dateToString': {
+        'format': '%G-W%V',
+        'date': {'$dateFromString': {
+            'dateString': f'${date_field}',
+            'format': '%Y-%m-%d',
+            'onError': None
+        }}
+    }}
+
+def _period_key(date, granularity):
+    """Python tarafında aggregation ile aynı dönem anahtarını üretir"""
+    if granularity == 'month':
+        return date.strftime('%Y-%m')
+    if granularity == 'day':
+        return date.strftime('%Y-%m-%d')
+    iso_year, iso_week, _ = date.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+def _sum_by_period(collection, match, date_field, amount_field, granularity):
+    """Eşleşen belgelerin tutarlarını sunucu tarafında dönemlere göre toplar"""
+    pipeline = [
+        {'$match': match},
+        {'$group': {
+            '_id': _period_key_expression(date_field, granularity),
+            'total': {'$sum': {'$toDouble': f'${amount_field}'}}
+        }}
+    ]
+    return {item['_id']: item['total'] for item in collection.aggregate(pipeline) if item['_id']}
+
+def get_monthly_balance_report(user_email, year=None, end_year=None, granularity='month'):
+    """Kullanıcının gelir-gider dengesini aylık, haftalık veya günlük olarak hesaplar"""
+    if year is None:
+        year = datetime.datetime.now().year
+    if end_year is None:
+        end_year = year
+    
+    # Bütçe bilgisini al
+    budget = budgets.find_one({'email': user_email})
+    if not budget:
+        return None
+    
+    range_start = datetime.date(year, 1, 1)
+    range_end = datetime.date(end_year + 1, 1, 1)
+    date_range = {'$gte': range_start.isoformat(), '$lt': range_end.isoformat()}
+    
+    # Fatura ve kredi kartı ödemelerini koleksiyon başına tek sorguda, aynı anda topla
+    bill_totals, card_totals = run_concurrently(
+        lambda: _sum_by_period(
+            bills,
+            {'email': user_email, 'is_paid': True, 'end_date': date_range},
+            'end_date', 'amount', granularity
+        ),
+        lambda: _sum_by_period(
+            credit_cards,
+            {'email': user_email, 'due_date_end': date_range},
+            'due_date_end', 'current_balance', granularity
+        )
+    )
+    
+    income = float(budget['initial_budget'])
+    
+    # Aralıktaki dönemleri sırayla oluştur
+    if granularity == 'month':
+        periods = [(datetime.date(y, m, 1), MONTH_NAMES[m - 1])
+                   for y in range(year, end_year + 1) for m in range(1, 13)]
+    else:
+        step = datetime.timedelta(days=7 if granularity == 'week' else 1)
+        first = range_start
+        if granularity == 'week':
+            first -= datetime.timedelta(days=range_start.weekday())
+        periods = []
+        current = first
+        while current < range_end:
+            periods.append((current, None))
+            current += step
+    
+    report_data = []
+    for period_date, month_name in periods:
+        key = _period_key(period_date, granularity)
+        row = {
+            'period': key,
+            'income': income,
+            'expense': bill_totals.get(key, 0) + card_totals.get(key, 0)
+        }
+        if month_name:
+            row['month'] = month_name
+        report_data.append(row)
+    
+    return report_data
+
+def get_category_spending_report(user_email, year=None):
+    """Kullanıcının kategori bazlı harcama oranlarını hesaplar"""
+    if year is None:
+        year = datetime.datetime.now().year
+    
+    # Bütçe bilgisini al
+    budget = budgets.find_one({'email': user_email})
+    if not budget:
+        return None
+    
+    # Kategorilere göre toplam harcamaları veritabanında hesapla
+    category_totals = spending_logs.aggregate([
+        {'$match': {
+            'email': user_email,
+            'date': {
+                '$gte': datetime.datetime(year, 1, 1),
+                '$lt': datetime.datetime(year + 1, 1, 1)
+            }
+        }},
+        {'$group': {'_id': '$category', 'total': {'$sum': {'$toDouble': '$amount'}}}}
+    ])
+    
+    # Kategori verilerini oluştur
+    category_data = []
+    for item in category_totals:
+        category_data.append({
+            'name': item['_id'],
+            'value': item['total']
+        })
+    
+    return category_data or None
+
+@bp.route('/generate_report', methods=['POST'])
+def generate_report():
+    data = request.get_json()
+    
+    # Check required fields
+    if not data or 'report_type' not in data or 'email' not in data:
+        return jsonify({'error': 'Report type and email are required'}), 400
+    
+    report_type = data['report_type']
+    user_email = data['email']
+    year = _parse_int(data.get('year', datetime.datetime.now().year))
+    end_year = _parse_int(data.get('end_year', year))
+    granularity = data.get('granularity', 'month')
+    
+    if year is None or end_year is None or not 1 <= year <= 9999 or not 1 <= end_year <= 9999:
+        return jsonify({'error': 'year and end_year must be integers between 1 and 9999'}), 400
+    if end_year < year:
+        return jsonify({'error': 'end_year must not be before year'}), 400
+    if granularity not in REPORT_GRANULARITIES:
+        return jsonify({'error': 'Invalid granularity, expected one of: month, week, day'}), 400
+    max_years = REPORT_MAX_YEARS[granularity]
+    if end_year - year >= max_years:
+        return jsonify({'error': f'A {granularity} report can span at most {max_years} years'}), 400
+    
+    # Check if user exists
+    user = users.find_one({'email': user_email})
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    try:
+        if report_type == 'monthly_balance':
+            # Gelir-Gider Dengesi Raporu
+            report_data = report_cache.get_or_compute(
+                user_email, report_type, year, end_year, granularity,
+                lambda: get_monthly_balance_report(user_email, year, end_year, granularity)
+            )
+            if not report_data:
+                return jsonify({'error': 'No data available for the specified period'}), 404
+            
+            return jsonify({
+                'report_type': 'monthly_balance',
+                'year': year,
+                'end_year': end_year,
+                'granularity': granularity,
+                'monthly_data': report_data
+            }), 200
+            
+        elif report_type == 'category_spending':
+            # Kategori Bazlı Harcama Raporu
+            report_data = report_cache.get_or_compute(
+                user_email, report_type, year, year, None,
+                lambda: get_category_spending_report(user_email, year)
+            )
+            if not report_data:
+                return jsonify({'error': 'No spending data available for the specified period'}), 404
+            
+            return jsonify({
+                'report_type': 'category_spending',
+                'year': year,
+                'category_data': report_data
+            }), 200
+            
+        elif report_type == 'cash_flow_forecast':
+            # Nakit Akışı Tahmini: önümüzdeki N ay için günlük bakiye projeksiyonu
+            months = _parse_int(data.get('months', 3))
+            if months is None or not 1 <= months <= FORECAST_MAX_MONTHS:
+                return jsonify({'error': f'months must be between 1 and {FORECAST_MAX_MONTHS}'}), 400
+            
+            # pandas/numpy yalnızca bu rapor istendiğinde yüklenir
+            from forecast import forecast_user
+            report_data = forecast_user(get_db('reports'), user_email, months)
+            if not report_data:
+                return jsonify({'error': 'Budget not found'}), 404
+            
+            return jsonify({
+                'report_type': 'cash_flow_forecast',
+                'months': months,
+                'forecast_data': report_data
+            }), 200
+            
+        else:
+            return jsonify({'error': 'Invalid report type'}), 400
+            
+    except Exception as e:       
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,186 @@
+import datetime
+import os
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from export import stream_export, EXPORT_FORMATS, EXPORT_MIMETYPES
+from pagination import InvalidCursor, DESCENDING
+from spending_import import import_spending_logs, read_rows, IMPORT_FORMATS
+from rollups import record_spending, remove_spending, get_category_totals
+from extensions import (spending_logs, spending_totals, report_cache, data_versions, get_client, get_db,
+                        spending_transactions_supported)
+from blueprints.common import paginate_fields, conditional
+
+bp = Blueprint('spending', __name__)
+
+
+def write_spending(callback):
+    """Harcama kaydı ile toplamlarını değiştiren callback(session)'ı mümkünse tek transaction'da çalıştırır.
+    Transaction yoksa (tek sunucu veya timeseries modu) iki yazma ayrı yapılır; arada bir hata toplamları
+    kaydırabilir ve verify-rollups / rebuild-rollups ile düzeltilir."""
+    if not spending_transactions_supported():
+        return callback(None)
+    with get_client().start_session() as session:
+        return session.with_transaction(callback)
+
+
+@bp.route('/spending-log', methods=['POST'])
+def add_spending_log():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'category' not in data or 'amount' not in data:
+        return jsonify({'error': 'Category and amount are required'}), 400
+    
+    # Get user email from session (you'll need to implement session management)
+    user_email = request.headers.get('X-User-Email')  # Assuming email is passed in header
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Create new spending log
+    spending_log = {
+        'email': user_email,
+        'category': data['category'],
+        'amount': float(data['amount']),
+        'date': datetime.datetime.now()
+    }
+    
+    def insert(session):
+        spending_logs.insert_one(spending_log, session=session)
+        record_spending(spending_totals, user_email, spending_log['category'], spending_log['amount'],
+                        spending_log['date'], session)
+
+    write_spending(insert)
+    report_cache.invalidate(user_email, 'category_spending', [spending_log['date'].year])
+    data_versions.bump(user_email)
+    return jsonify({'message': 'Spending log added successfully'}), 201
+
+@bp.route('/spending-summary', methods=['GET'])
+@conditional
+def get_spending_summary():
+    # Get user email from session
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Kategori toplamları yazma anında güncellenen rollup'lardan okunur
+    result = get_category_totals(spending_totals, user_email)
+    
+    # Format the response
+    summary = [{'category': item['category'], 'total_amount': item['total']} for item in result]
+    
+    return jsonify({'spending_summary': summary}), 200
+
+@bp.route('/spending-log', methods=['DELETE'])
+def delete_spending_log():
+    data = request.get_json()
+    
+    # Check if required fields are present
+    if not data or 'category' not in data:
+        return jsonify({'error': 'Category is required'}), 400
+    
+    # Get user email from session
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Delete all spending logs for the given category and user, and update totals
+    deleted_count = write_spending(lambda session: remove_spending(spending_totals, spending_logs, {
+        'email': user_email,
+        'category': data['category']
+    }, session))
+    
+    if deleted_count == 0:
+        return jsonify({'error': 'No spending logs found for the given category'}), 404
+    
+    report_cache.invalidate(user_email, 'category_spending')
+    data_versions.bump(user_email)
+    
+    return jsonify({'message': f'Successfully deleted {deleted_count} spending logs'}), 200
+
+@bp.route('/spending-log/import', methods=['POST'])
+def import_spending_log_file():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    # Accept a multipart upload ('file') or the raw request body
+    upload = request.files.get('file')
+    if upload:
+        stream = upload.stream
+        filename = upload.filename or ''
+    else:
+        stream = request.stream
+        filename = ''
+    
+    # Format: ?format=csv|ndjson, else the file extension, else the content type
+    fmt = request.args.get('format')
+    if not fmt:
+        if filename.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (request.content_type or ''):
+            fmt = 'ndjson'
+        else:
+            fmt = 'csv'
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({'error': 'Invalid format, expected one of: csv, ndjson'}), 400
+    
+    batch_size = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+    result = import_spending_logs(spending_logs, spending_totals, user_email, read_rows(stream, fmt), batch_size)
+    if result['inserted']:
+        report_cache.invalidate(user_email, 'category_spending')
+        data_versions.bump(user_email)
+    
+    # Dosya yarıda okunamadıysa önceki satırlar eklenmiş olsa da 400 döner (error alanında satır numarası)
+    status = 201 if result['inserted'] and 'error' not in result else 400
+    return jsonify({'message': f"Imported {result['inserted']} spending logs", **result}), status
+
+@bp.route('/export', methods=['GET'])
+def export_user_data():
+    # Get user email from header
+    user_email = request.headers.get('X-User-Email')
+    
+    if not user_email:
+        return jsonify({'error': 'User not authenticated'}), 401
+    
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid format, expected one of: ndjson, csv, parquet'}), 400
+    
+    # Kayıtlar cursor'dan parça parça okunup akıtılır, bellekte liste oluşturulmaz
+    chunks = stream_export(get_db(), user_email, fmt, batch_size=int(os.getenv('EXPORT_BATCH_SIZE', 1000)))
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename=finance-export.{fmt}'}
+    )
+
+@bp.route('/recent-expenses', methods=['GET'])
+def get_recent_expenses():
+    try:
+        email = request.headers.get('X-User-Email')
+        if not email:
+            return jsonify({'error': 'Kullanıcı bilgisi bulunamadı'}), 401
+
+        # Son harcamaları sayfa sayfa al (varsayılan 10)
+        try:
+            expenses, next_cursor = paginate_fields(
+                spending_logs, {'email': email}, ['category', 'amount', 'date'], 'date', DESCENDING,
+                default_page_size=10
+            )
+        except (InvalidCursor, ValueError):
+            return jsonify({'error': 'Invalid cursor or limit'}), 400
+        
+        expense_list = []
+        for expense in expenses:
+            expense_list.append({
+                'description': expense['category'],
+                'amount': expense['amount'],
+                'date': expense['date'].date()
+            })
+
+        return jsonify({'expenses': expense_list, 'next_cursor': next_cursor}), 200
+    except Exception as e:
+        print(f"Error in get_recent_expenses: {str(e)}")
+        return jsonify({'error': str(e)}), 500
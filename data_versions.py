@@ -0,0 +1,34 @@
+import hashlib
+from pymongo import UpdateOne
+
+# Kullanıcı veri sürümleri (data_versions) belgeleri: {_id: email, v: n}
+# Bütçe, harcama, fatura veya kart verisini değiştiren her yazma, yazmadan sonra kullanıcının sayacını artırır.
+# Okuma endpoint'leri sayacı ETag olarak döndürür; If-None-Match eşleşirse sorgular çalıştırılmadan 304 döner.
+# '*' belgesi tüm kullanıcıları etkileyen toplu işlemler (ör. rebuild-rollups) içindir.
+ALL_USERS = '*'
+
+
+class DataVersions:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def bump(self, email):
+        self.collection.update_one({'_id': email}, {'$inc': {'v': 1}}, upsert=True)
+
+    def bump_many(self, emails):
+        if emails:
+            self.collection.bulk_write(
+                [UpdateOne({'_id': email}, {'$inc': {'v': 1}}, upsert=True) for email in emails],
+                ordered=False
+            )
+
+    def bump_all(self):
+        self.bump(ALL_USERS)
+
+    def etag(self, email):
+        """Kullanıcının ve genel sayacın tek sorguyla okunan güncel ETag değeri"""
+        versions = {doc['_id']: doc.get('v', 0)
+                    for doc in self.collection.find({'_id': {'$in': [email, ALL_USERS]}})}
+        # E-posta özeti, aynı adresteki başka bir kullanıcının sayacıyla eşleşmeyi önler
+        digest = hashlib.sha1(email.encode('utf-8')).hexdigest()[:12]
+        return f'{digest}-{versions.get(email, 0)}-{versions.get(ALL_USERS, 0)}'
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+
+DEFAULT_RATE_SOURCE = 'https://open.er-api.com/v6/latest/USD'
+
+
+class HttpRateBackend:
+    """Kurları HTTP üzerinden open.er-api.com biçiminde alır"""
+
+    def __init__(self, url, timeout=3):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        # requests yalnızca HTTP kaynağı kullanıldığında yüklenir
+        import requests
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class FileRateBackend:
+    """Kurları yerel bir JSON dosyasından okur (testler ve internetsiz kurulumlar için)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def create_rate_backend(source, timeout=3):
+    """Kaynak adresine göre uygun backend'i oluşturur (http(s) adresi veya dosya yolu)"""
+    if source.startswith(('http://', 'https://')):
+        return HttpRateBackend(source, timeout)
+    if source.startswith('file://'):
+        source = source[len('file://'):]
+    return FileRateBackend(source)
+
+
+class RateProvider:
+    """Kurları bellekte önbellekler; süresi dolunca eski veriyi döndürüp arka planda yeniler"""
+
+    def __init__(self, backend, ttl_seconds=600, failure_threshold=3, cooldown_seconds=60):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._data = None
+        self._fetched_at = 0
+        self._failures = 0
+        self._circuit_open_until = 0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def get(self):
+        """Önbellekteki kurları döndürür; hiç veri yoksa senkron olarak yükler.
+        İlk yüklemeyi tek çağrı yapar, eşzamanlı diğer çağrılar onu bekler."""
+        if self._data is None:
+            with self._load_lock:
+                if self._data is None:
+                    self.refresh()
+            if self._data is None:
+                raise RuntimeError('Exchange rates are not available')
+        elif time.monotonic() - self._fetched_at > self.ttl_seconds:
+            self._refresh_in_background()
+        return self._data
+
+    def refresh(self):
+        """Kurları backend'den yükler; devre açıksa (art arda hatalar) istek yapılmaz"""
+        if time.monotonic() < self._circuit_open_until:
+            return False
+        try:
+            data = self.backend.fetch()
+            self._data = {
+                'base': data['base_code'],
+                'date': data['time_last_update_utc'],
+                'rates': data['rates']
+            }
+            self._fetched_at = time.monotonic()
+            self._failures = 0
+            return True
+        except Exception as e:
+            print(f"Exchange rate refresh failed: {str(e)}")
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._circuit_open_until = time.monotonic() + self.cooldown_seconds
+            return False
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name='exchange-rate-refresh', daemon=True).start()
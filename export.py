@@ -0,0 +1,157 @@
+import csv
+import datetime
+import io
+import orjson
+from spending_storage import SPENDING_LOGS
+
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# Dışa aktarılan koleksiyonlar: (kayıt tipi, koleksiyon, projection, sıralama)
+EXPORT_SOURCES = [
+    ('spending_log', SPENDING_LOGS, {'_id': 0, 'category': 1, 'amount': 1, 'date': 1}, [('date', 1)]),
+    ('bill', 'bills',
+     {'_id': 0, 'bill_name': 1, 'category': 1, 'amount': 1, 'start_date': 1, 'end_date': 1,
+      'is_paid': 1, 'is_notification_enabled': 1}, None),
+    ('credit_card', 'credit_cards',
+     {'_id': 0, 'bank_name': 1, 'card_limit': 1, 'due_date_start': 1, 'due_date_end': 1, 'current_balance': 1},
+     None),
+]
+
+# CSV ve Parquet için tüm kayıt tiplerini kapsayan sabit kolonlar
+EXPORT_COLUMNS = ['type', 'category', 'amount', 'date', 'bill_name', 'start_date', 'end_date', 'is_paid',
+                  'is_notification_enabled', 'bank_name', 'card_limit', 'due_date_start', 'due_date_end',
+                  'current_balance']
+
+NUMERIC_COLUMNS = ['amount', 'card_limit', 'current_balance']
+BOOLEAN_COLUMNS = ['is_paid', 'is_notification_enabled']
+
+# Yanıt parçalarının yaklaşık boyutu
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_records(db, email, batch_size=1000):
+    """Kullanıcının tüm kayıtlarını cursor üzerinden tek tek döndürür"""
+    for record_type, collection_name, projection, sort in EXPORT_SOURCES:
+        cursor = db[collection_name].find({'email': email}, projection).batch_size(batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+        for doc in cursor:
+            doc['type'] = record_type
+            yield doc
+
+
+def _json_default(value):
+    # datetime/date orjson tarafından ISO 8601 olarak yazılır
+    return str(value)
+
+
+def stream_ndjson(records):
+    buffer = []
+    size = 0
+    for record in records:
+        line = orjson.dumps(record, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def stream_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, restval='', extrasaction='ignore')
+    writer.writeheader()
+    for record in records:
+        if isinstance(record.get('date'), datetime.datetime):
+            record['date'] = record['date'].isoformat()
+        writer.writerow(record)
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Parquet yazıcısının çıktısını parça parça toplayan, yalnızca ekleme yapan dosya nesnesi"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(records, row_group_size=10000):
+    """Kayıtları pandas ile row group'lara çevirip Parquet olarak akıtır"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [(column, pa.float64()) if column in NUMERIC_COLUMNS
+         else (column, pa.bool_()) if column in BOOLEAN_COLUMNS
+         else (column, pa.timestamp('ms')) if column == 'date'
+         else (column, pa.string())
+         for column in EXPORT_COLUMNS]
+    )
+
+    def to_table(rows):
+        frame = pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+        for column in NUMERIC_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce')
+        for column in BOOLEAN_COLUMNS:
+            frame[column] = frame[column].astype('boolean')
+        frame['date'] = pd.to_datetime(frame['date'], errors='coerce')
+        for column in EXPORT_COLUMNS:
+            if schema.field(column).type == pa.string():
+                frame[column] = frame[column].where(frame[column].isna(), frame[column].astype(str))
+        return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    rows = []
+    for record in records:
+        rows.append(record)
+        if len(rows) >= row_group_size:
+            writer.write_table(to_table(rows))
+            rows = []
+            yield sink.take()
+    if rows:
+        writer.write_table(to_table(rows))
+    writer.close()
+    yield sink.take()
+
+
+def stream_export(db, email, fmt, batch_size=1000):
+    """İstenen formatta dışa aktarım parçalarını üreten generator döndürür"""
+    records = iter_records(db, email, batch_size)
+    if fmt == 'csv':
+        return stream_csv(records)
+    if fmt == 'parquet':
+        return stream_parquet(records)
+    return stream_ndjson(records)
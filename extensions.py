@@ -0,0 +1,187 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from flask_mail import Mail
+from pymongo import MongoClient
+from indexes import ensure_indexes
+from mail_queue import MailDispatcher
+from passwords import PasswordHasher
+from exchange_rates import RateProvider, create_rate_backend, DEFAULT_RATE_SOURCE
+from report_cache import ReportCache
+from data_versions import DataVersions
+from payments import supports_transactions
+from metrics import command_listener
+from spending_storage import SPENDING_LOGS, STORAGE_MODE
+from mongo_config import client_options, read_preference, reads_from_primary
+from profiling import query_listener
+
+# Uygulama genelinde paylaşılan kaynaklar. Hiçbiri import sırasında bağlantı açmaz veya
+# thread başlatmaz; MongoClient ilk sorguda, arka plan servisleri ilk istekte oluşturulur.
+
+DATABASE_NAME = os.getenv('MONGODB_DATABASE', 'auth_db')
+
+_client = None
+_client_lock = threading.Lock()
+_workload_dbs = {}
+
+
+def get_client():
+    """MongoClient'ı ilk kullanımda oluşturur, sonraki çağrılarda aynı istemciyi döndürür.
+    Havuz boyutu ve zaman aşımları mongo_config.CLIENT_OPTIONS ortam değişkenlerinden okunur."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'),
+                                      event_listeners=[command_listener, query_listener], **client_options())
+    return _client
+
+
+def get_db(workload=None):
+    """workload (reports, summaries, jobs) verilirse okumalar o iş yükünün okuma tercihiyle yapılır;
+    yazmalar her durumda primary'ye gider"""
+    if workload is None:
+        return get_client()[DATABASE_NAME]
+    db = _workload_dbs.get(workload)
+    if db is None:
+        db = _workload_dbs[workload] = get_client().get_database(
+            DATABASE_NAME, read_preference=read_preference(workload))
+    return db
+
+
+_transactions_supported = None
+
+
+def transactions_supported():
+    """Sunucunun transaction desteğini ilk kullanımda bir kez kontrol eder"""
+    global _transactions_supported
+    if _transactions_supported is None:
+        _transactions_supported = supports_transactions(get_client())
+    return _transactions_supported
+
+
+def spending_transactions_supported():
+    """Harcama kaydı ve toplamları birlikte yazılabilir mi; time-series koleksiyonlarına
+    transaction içinde yazılamadığından timeseries modunda her zaman False"""
+    return STORAGE_MODE != 'timeseries' and transactions_supported()
+
+
+class LazyCollection:
+    """Koleksiyon vekili; ilk işlemde bağlantıyı açar, geri kalanını gerçek koleksiyona iletir"""
+
+    def __init__(self, name, workload=None):
+        self.name = name
+        self.workload = workload
+
+    def __getattr__(self, attr):
+        return getattr(get_db(self.workload)[self.name], attr)
+
+
+users = LazyCollection('users')
+budgets = LazyCollection('budgets')
+credit_cards = LazyCollection('credit_cards')
+bills = LazyCollection('bills')
+spending_logs = LazyCollection(SPENDING_LOGS)
+spending_totals = LazyCollection('spending_totals')
+
+# Bir istek içindeki bağımsız sorguları paralel çalıştırmak için havuz (pymongo thread-safe'tir).
+# İlk sorguyu çağıran thread kendisi çalıştırır; mevcut fan-out'lar iki sorguluk olduğundan istek başına
+# en fazla bir havuz thread'i gerekir. Havuz bu yüzden sürecin istek thread sayısı (SERVER_THREADS,
+# ör. gunicorn --threads) kadardır ve yük altında istekler havuz kuyruğunda birbirini beklemez.
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', 8))
+QUERY_FANOUT_WORKERS = int(os.getenv('QUERY_FANOUT_WORKERS', 0)) or SERVER_THREADS
+# False ise bağımsız sorgular sırayla çalışır (fan-out ile karşılaştırma için)
+QUERY_FANOUT = os.getenv('QUERY_FANOUT', 'True') == 'True'
+query_executor = ThreadPoolExecutor(max_workers=QUERY_FANOUT_WORKERS, thread_name_prefix='query')
+
+
+def run_concurrently(*calls):
+    """Birbirinden bağımsız sorguları aynı anda çalıştırır, sonuçları verilen sırayla döndürür.
+    Cursor'lar tembel olduğundan her çağrı sonucunu kendisi okumalıdır (ör. list(...)).
+    Havuza verilen çağrılar isteğin context'inin bir kopyasında çalışır; sorgular isteğin profiline sayılır."""
+    if not QUERY_FANOUT or len(calls) < 2:
+        return [call() for call in calls]
+    futures = [query_executor.submit(contextvars.copy_context().run, call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
+
+
+# Rapor sonuçları önbelleği; yazma işlemleri ilgili kullanıcı ve dönemi geçersiz kılar
+# Sürümler her zaman primary'den okunur
+report_cache = ReportCache(
+    LazyCollection('report_versions'),
+    max_entries=int(os.getenv('REPORT_CACHE_SIZE', 1024)),
+    open_ttl_seconds=int(os.getenv('REPORT_CACHE_TTL', 300)),
+    closed_ttl_seconds=None if reads_from_primary('reports') else int(os.getenv('REPORT_CACHE_TTL', 300))
+)
+
+# Kullanıcı başına veri sürümü; okuma endpoint'lerinin ETag değeri
+data_versions = DataVersions(LazyCollection('data_versions'))
+
+# bcrypt işlemleri istek thread'lerini kilitlememek için sınırlı bir havuzda çalışır
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv('BCRYPT_ROUNDS', 12)),
+    workers=int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None,
+    max_queue=int(os.getenv('PASSWORD_HASH_QUEUE', 32))
+)
+
+# Döviz kurları bellekte önbelleklenir, süresi dolunca arka planda yenilenir
+rate_provider = RateProvider(
+    create_rate_backend(
+        os.getenv('EXCHANGE_RATE_SOURCE', DEFAULT_RATE_SOURCE),
+        timeout=float(os.getenv('EXCHANGE_RATE_TIMEOUT', 3))
+    ),
+    ttl_seconds=int(os.getenv('EXCHANGE_RATE_TTL', 600))
+)
+
+
+def init_mail(app):
+    """Flask-Mail'i ve e-posta kuyruğunu uygulamaya bağlar; worker'lar start_background_services ile başlar"""
+    # Initialize Flask-Mail only if email credentials are provided
+    # (MAIL_REQUIRE_AUTH=False allows local SMTP servers without authentication)
+    if not ((app.config['MAIL_USERNAME'] and app.config['MAIL_PASSWORD'])
+            or os.getenv('MAIL_REQUIRE_AUTH', 'True') != 'True'):
+        print("Warning: Email configuration is incomplete. Email notifications will not work.")
+        return
+    mail = Mail(app)
+    # E-postalar kalıcı kuyruğa yazılır, worker'lar SMTP bağlantısını yeniden kullanarak gönderir
+    app.extensions['mail_dispatcher'] = MailDispatcher(
+        app, mail, LazyCollection('mail_queue'),
+        workers=int(os.getenv('MAIL_WORKERS', 2)),
+        batch_size=int(os.getenv('MAIL_BATCH_SIZE', 50)),
+        max_attempts=int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+    )
+
+
+def get_mail_dispatcher(app=None):
+    app = app or current_app
+    return app.extensions.get('mail_dispatcher')
+
+
+_services_lock = threading.Lock()
+
+
+def start_background_services(app):
+    """Index'leri, e-posta worker'larını ve zamanlayıcıyı süreç başına bir kez başlatır"""
+    if app.extensions.get('background_services_started'):
+        return
+    with _services_lock:
+        if app.extensions.get('background_services_started'):
+            return
+        app.extensions['background_services_started'] = True
+
+        # Index'leri oluştur (ENSURE_INDEXES=False ile kapatılabilir)
+        if os.getenv('ENSURE_INDEXES', 'True') == 'True':
+            try:
+                ensure_indexes(get_db())
+            except Exception as e:
+                print(f"Warning: Index provisioning failed: {str(e)}")
+
+        dispatcher = get_mail_dispatcher(app)
+        if dispatcher:
+            dispatcher.start()
+
+        from jobs import start_scheduler
+        start_scheduler(app)
@@ -0,0 +1,221 @@
+import datetime
+import numpy as np
+import pandas as pd
+from pymongo import ReplaceOne
+from spending_storage import SPENDING_LOGS
+
+# Trend ve mevsimsellik için kullanılan geçmiş ay sayısı
+HISTORY_MONTHS = 24
+# Mevsimsellik katsayısı hesaplamak için gereken en az aktif ay
+SEASONALITY_MIN_MONTHS = 12
+
+
+def _month_start(date):
+    return pd.Timestamp(date.year, date.month, 1)
+
+
+def load_monthly_spending(db, today, email=None):
+    """Harcamaları veritabanında (kullanıcı, kategori, ay) bazında toplayıp DataFrame döndürür"""
+    history_start = _month_start(today) - pd.DateOffset(months=HISTORY_MONTHS)
+    match = {'date': {'$gte': history_start.to_pydatetime(), '$lt': _month_start(today).to_pydatetime()}}
+    if email:
+        match['email'] = email
+    rows = db[SPENDING_LOGS].aggregate([
+        {'$match': match},
+        {'$group': {
+            '_id': {
+                'email': '$email',
+                'category': '$category',
+                'period': {'$dateToString': {'format': '%Y-%m', 'date': '$date'}}
+            },
+            'total': {'$sum': {'$toDouble': '$amount'}}
+        }}
+    ], allowDiskUse=True)
+    frame = pd.DataFrame(
+        [(row['_id']['email'], row['_id']['category'], row['_id']['period'], row['total']) for row in rows],
+        columns=['email', 'category', 'period', 'total']
+    )
+    frame['period'] = pd.to_datetime(frame['period'], format='%Y-%m')
+    return frame
+
+
+def load_scheduled_payments(db, today, horizon_end, email=None):
+    """Ödenmemiş faturaları ve kart son ödeme tarihlerini (email, tarih, tutar) olarak döndürür"""
+    base = {'email': email} if email else {}
+    end = horizon_end.strftime('%Y-%m-%d')
+    bill_rows = db.bills.find(dict(base, is_paid=False, end_date={'$lt': end}),
+                              {'_id': 0, 'email': 1, 'end_date': 1, 'amount': 1})
+    card_rows = db.credit_cards.find(dict(base, due_date_end={'$gte': today.strftime('%Y-%m-%d'), '$lt': end}),
+                                     {'_id': 0, 'email': 1, 'due_date_end': 1, 'current_balance': 1})
+    frame = pd.DataFrame(
+        [(row['email'], row['end_date'], row['amount']) for row in bill_rows] +
+        [(row['email'], row['due_date_end'], row['current_balance']) for row in card_rows],
+        columns=['email', 'date', 'amount']
+    )
+    frame['date'] = pd.to_datetime(frame['date'], format='%Y-%m-%d', errors='coerce')
+    frame['amount'] = pd.to_numeric(frame['amount'], errors='coerce')
+    return frame.dropna()
+
+
+def load_start_balances(db, email=None):
+    """Başlangıç bakiyesi: bütçe - toplam harcama (GET /budget ile aynı)"""
+    base = {'email': email} if email else {}
+    budget_frame = pd.DataFrame(
+        [(row['email'], row['initial_budget'])
+         for row in db.budgets.find(base, {'_id': 0, 'email': 1, 'initial_budget': 1})],
+        columns=['email', 'budget']
+    )
+    spent_frame = pd.DataFrame(
+        [(row['email'], row['total'])
+         for row in db.spending_totals.find(dict(base, period='all', category=None),
+                                            {'_id': 0, 'email': 1, 'total': 1})],
+        columns=['email', 'spent']
+    )
+    frame = budget_frame.merge(spent_frame, on='email', how='left').fillna({'spent': 0})
+    frame['budget'] = pd.to_numeric(frame['budget'], errors='coerce').fillna(0)
+    return pd.Series((frame['budget'] - frame['spent']).to_numpy(), index=frame['email'])
+
+
+def _fit_category_models(monthly, periods):
+    """Her (kullanıcı, kategori) serisi için ağırlıklı doğrusal trend ve aylık mevsimsellik katsayıları"""
+    matrix = monthly.pivot_table(index=['email', 'category'], columns='period', values='total',
+                                 aggfunc='sum', fill_value=0.0).reindex(columns=periods, fill_value=0.0)
+    y = matrix.to_numpy(dtype=float)
+    t = np.arange(len(periods), dtype=float)
+
+    # Kullanıcının ilk harcama yaptığı aydan önceki boş aylar trendi bozmasın
+    user_totals = monthly.groupby(['email', 'period'])['total'].sum().unstack().reindex(columns=periods).fillna(0)
+    first_active = (user_totals.to_numpy() > 0).argmax(axis=1)
+    first_by_user = pd.Series(first_active, index=user_totals.index)
+    series_first = first_by_user.reindex(matrix.index.get_level_values('email')).to_numpy()
+    weights = (t[None, :] >= series_first[:, None]).astype(float)
+
+    active = weights.sum(axis=1)
+    t_mean = (weights * t).sum(axis=1) / active
+    y_mean = (weights * y).sum(axis=1) / active
+    t_dev = t[None, :] - t_mean[:, None]
+    denominator = (weights * t_dev ** 2).sum(axis=1)
+    slope = np.divide((weights * t_dev * (y - y_mean[:, None])).sum(axis=1), denominator,
+                      out=np.zeros_like(denominator), where=denominator > 0)
+    intercept = y_mean - slope * t_mean
+
+    # Mevsimsellik: gerçekleşen / trend oranlarının takvim ayı ortalaması
+    fitted = intercept[:, None] + slope[:, None] * t[None, :]
+    valid = (weights > 0) & (fitted > 0)
+    ratio = np.divide(y, fitted, out=np.zeros_like(y), where=valid)
+    calendar_months = np.array([period.month for period in periods])
+    season = np.ones((len(y), 12))
+    for month in range(1, 13):
+        in_month = valid & (calendar_months[None, :] == month)
+        counts = in_month.sum(axis=1)
+        sums = np.where(in_month, ratio, 0).sum(axis=1)
+        season[:, month - 1] = np.divide(sums, counts, out=np.ones_like(sums), where=counts > 0)
+    season[active < SEASONALITY_MIN_MONTHS] = 1.0
+    season = np.clip(season, 0.0, 3.0)
+    return matrix.index, intercept, slope, season
+
+
+def forecast(monthly, scheduled, start_balances, today, months):
+    """Tüm kullanıcılar için günlük bakiye projeksiyonunu vektörel olarak hesaplar.
+    (kullanıcılar, günler, günlük harcama matrisi, günlük planlı ödeme matrisi, bakiye matrisi,
+    kategori bazlı aylık projeksiyon DataFrame'i) döndürür."""
+    today = pd.Timestamp(today).normalize()
+    current_month = _month_start(today)
+    periods = list(pd.date_range(current_month - pd.DateOffset(months=HISTORY_MONTHS), periods=HISTORY_MONTHS,
+                                 freq='MS'))
+    future_months = pd.date_range(current_month, periods=months + 1, freq='MS')
+    days = pd.date_range(today, today + pd.DateOffset(months=months), freq='D', inclusive='left')
+
+    users = pd.Index(sorted(set(start_balances.index) | set(monthly['email']) | set(scheduled['email'])))
+    daily_spending = np.zeros((len(users), len(days)))
+    category_projection = pd.DataFrame(columns=['email', 'category'] + [m.strftime('%Y-%m') for m in future_months])
+
+    if not monthly.empty:
+        series_index, intercept, slope, season = _fit_category_models(monthly, periods)
+        t_future = len(periods) + np.arange(len(future_months), dtype=float)
+        month_columns = future_months.month.to_numpy() - 1
+        projected = np.clip(
+            (intercept[:, None] + slope[:, None] * t_future[None, :]) * season[:, month_columns], 0, None
+        )
+        category_projection = pd.DataFrame(projected, index=series_index,
+                                           columns=[m.strftime('%Y-%m') for m in future_months]).reset_index()
+
+        # Aylık projeksiyonu günlere yay ve kullanıcı bazında topla
+        daily_rate = projected / future_months.days_in_month.to_numpy()[None, :]
+        day_month = ((days.year - current_month.year) * 12 + (days.month - current_month.month)).to_numpy()
+        user_rows = users.get_indexer(series_index.get_level_values('email'))
+        per_user_rate = np.zeros((len(users), len(future_months)))
+        np.add.at(per_user_rate, user_rows, daily_rate)
+        daily_spending = per_user_rate[:, day_month]
+
+    scheduled_payments = np.zeros((len(users), len(days)))
+    if not scheduled.empty and len(days):
+        # Vadesi geçmiş ödemeler bugüne eklenir
+        day_index = np.clip((scheduled['date'] - today).dt.days.to_numpy(), 0, len(days) - 1)
+        np.add.at(scheduled_payments, (users.get_indexer(scheduled['email']), day_index),
+                  scheduled['amount'].to_numpy(dtype=float))
+
+    start = start_balances.reindex(users).fillna(0).to_numpy(dtype=float)
+    balances = start[:, None] - np.cumsum(daily_spending + scheduled_payments, axis=1)
+    return users, days, daily_spending, scheduled_payments, balances, category_projection
+
+
+def forecast_user(db, email, months, today=None):
+    """Tek kullanıcı için günlük bakiye ve kategori projeksiyonu"""
+    today = today or datetime.date.today()
+    horizon_end = pd.Timestamp(today) + pd.DateOffset(months=months)
+    start_balances = load_start_balances(db, email)
+    if email not in start_balances.index:
+        return None
+    users, days, spending, scheduled, balances, categories = forecast(
+        load_monthly_spending(db, today, email),
+        load_scheduled_payments(db, today, horizon_end, email),
+        start_balances, today, months
+    )
+    row = users.get_loc(email)
+    month_columns = [column for column in categories.columns if column not in ('email', 'category')]
+    return {
+        'start_balance': float(start_balances[email]),
+        'daily': [
+            {'date': day.strftime('%Y-%m-%d'), 'projected_spending': round(float(s), 2),
+             'scheduled_payments': round(float(p), 2), 'balance': round(float(b), 2)}
+            for day, s, p, b in zip(days, spending[row], scheduled[row], balances[row])
+        ],
+        'categories': {
+            category: [round(float(value), 2) for value in values]
+            for category, values in zip(categories['category'], categories[month_columns].to_numpy())
+        },
+        'months': month_columns
+    }
+
+
+def forecast_all_users(db, months, today=None):
+    """Tüm kullanıcılar için tek geçişte tahmin yapar ve özetleri cash_flow_forecasts'a yazar"""
+    today = today or datetime.date.today()
+    horizon_end = pd.Timestamp(today) + pd.DateOffset(months=months)
+    users, days, _, _, balances, _ = forecast(
+        load_monthly_spending(db, today),
+        load_scheduled_payments(db, today, horizon_end),
+        load_start_balances(db), today, months
+    )
+    if not len(users) or not len(days):
+        return 0
+
+    min_index = balances.argmin(axis=1)
+    negative = balances < 0
+    first_negative = np.where(negative.any(axis=1), negative.argmax(axis=1), -1)
+    generated_at = datetime.datetime.now()
+    operations = [
+        ReplaceOne({'email': email}, {
+            'email': email,
+            'generated_at': generated_at,
+            'horizon_months': months,
+            'end_balance': float(balances[i, -1]),
+            'min_balance': float(balances[i, min_index[i]]),
+            'min_balance_date': days[min_index[i]].strftime('%Y-%m-%d'),
+            'first_negative_date': days[first_negative[i]].strftime('%Y-%m-%d') if first_negative[i] >= 0 else None
+        }, upsert=True)
+        for i, email in enumerate(users)
+    ]
+    db.cash_flow_forecasts.bulk_write(operations, ordered=False)
+    return len(operations)
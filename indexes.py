@@ -0,0 +1,150 @@
+import datetime
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+from spending_storage import SPENDING_LOGS, STORAGE_COLLECTIONS, ensure_collection
+
+# Her koleksiyon için endpoint'lerin ihtiyaç duyduğu index'ler
+INDEXES = {
+    'users': [
+        {'keys': [('email', ASCENDING)], 'name': 'email_unique', 'unique': True},
+    ],
+    'budgets': [
+        {'keys': [('email', ASCENDING)], 'name': 'email_unique', 'unique': True},
+        # Günlük düşük bütçe uyarı işi; shard_key, her parçanın yalnızca kendi aralığını taraması için
+        {'keys': [('alert_threshold', ASCENDING), ('shard_key', ASCENDING), ('initial_budget', ASCENDING)],
+         'name': 'alert_threshold_shard_key_initial_budget'},
+    ],
+    'bills': [
+        # /unpaid-bills, /upcoming-payments, /payments, aylık rapor
+        # _id, keyset sayfalamada eşit tarihleri sıralamak için
+        {'keys': [('email', ASCENDING), ('is_paid', ASCENDING), ('end_date', ASCENDING), ('_id', ASCENDING)],
+         'name': 'email_is_paid_end_date_id'},
+        # PUT/DELETE /bill, /make-payment
+        {'keys': [('email', ASCENDING), ('bill_name', ASCENDING)], 'name': 'email_bill_name'},
+        # Günlük fatura hatırlatma işi (parça bazında shard_key aralığıyla)
+        {'keys': [('is_paid', ASCENDING), ('is_notification_enabled', ASCENDING), ('shard_key', ASCENDING),
+                  ('end_date', ASCENDING)],
+         'name': 'is_paid_notification_shard_key_end_date'},
+    ],
+    'credit_cards': [
+        # /unpaid-cards, /upcoming-payments, aylık rapor
+        {'keys': [('email', ASCENDING), ('due_date_end', ASCENDING), ('_id', ASCENDING)],
+         'name': 'email_due_date_end_id'},
+        # PUT/DELETE /credit-card, /make-payment
+        {'keys': [('email', ASCENDING), ('bank_name', ASCENDING)], 'name': 'email_bank_name'},
+    ],
+    'spending_logs': [
+        # /recent-expenses, /home/messages, /budget, /spending-summary, kategori raporu
+        {'keys': [('email', ASCENDING), ('date', DESCENDING), ('_id', DESCENDING)], 'name': 'email_date_id'},
+        # DELETE /spending-log
+        {'keys': [('email', ASCENDING), ('category', ASCENDING), ('date', DESCENDING)],
+         'name': 'email_category_date'},
+    ],
+    # SPENDING_STORAGE=timeseries: (email, date) kova index'i MongoDB tarafından yönetilir
+    'spending_log_series': [
+        {'keys': [('email', ASCENDING), ('date', DESCENDING)], 'name': 'email_date'},
+        {'keys': [('email', ASCENDING), ('category', ASCENDING), ('date', DESCENDING)],
+         'name': 'email_category_date'},
+    ],
+    'mail_queue': [
+        # Worker'ların gönderilmeye hazır mesajları alması
+        {'keys': [('status', ASCENDING), ('available_at', ASCENDING)], 'name': 'status_available_at'},
+        # Gönderilmiş mesajlar 7 gün sonra silinir
+        {'keys': [('sent_at', ASCENDING)], 'name': 'sent_at_ttl', 'expireAfterSeconds': 7 * 24 * 3600},
+    ],
+    'cash_flow_forecasts': [
+        {'keys': [('email', ASCENDING)], 'name': 'email_unique', 'unique': True},
+    ],
+    'scheduler_leases': [
+        # Artık kullanılmayan shard lease'leri (ör. SCHEDULER_SHARDS değişince) bir gün sonra silinir
+        {'keys': [('expires_at', ASCENDING)], 'name': 'expires_at_ttl', 'expireAfterSeconds': 24 * 3600},
+    ],
+    'spending_totals': [
+        # /budget, /spending-summary ve harcama yazımlarındaki $inc güncellemeleri
+        {'keys': [('email', ASCENDING), ('period', ASCENDING), ('category', ASCENDING)],
+         'name': 'email_period_category_unique', 'unique': True},
+    ],
+}
+
+# Endpoint'lerin sorgu şekilleri; audit bunların her birine explain() çalıştırır
+_AUDIT_EMAIL = 'audit@example.com'
+
+QUERY_SHAPES = [
+    ('register/login', 'users', {'email': _AUDIT_EMAIL}, None),
+    ('budget', 'budgets', {'email': _AUDIT_EMAIL}, None),
+    ('budget alert job', 'budgets',
+     {'low_budget_alerted_at': None, 'shard_key': {'$gte': 0, '$lt': 2 ** 31},
+      '$or': [{'alert_threshold': None, 'initial_budget': {'$lt': 200}},
+              {'alert_threshold': {'$ne': None}, '$expr': {'$lt': ['$initial_budget', '$alert_threshold']}}]},
+     None),
+    ('unpaid-bills', 'bills', {'email': _AUDIT_EMAIL, 'is_paid': False}, [('end_date', ASCENDING), ('_id', ASCENDING)]),
+    ('upcoming-payments bills', 'bills',
+     {'email': _AUDIT_EMAIL, 'is_paid': False, 'end_date': {'$gte': '2024-01-01', '$lte': '2024-01-31'}}, None),
+    ('monthly report bills', 'bills',
+     {'email': _AUDIT_EMAIL, 'is_paid': True, 'end_date': {'$gte': '2024-01-01', '$lt': '2024-02-01'}}, None),
+    ('update/delete bill', 'bills', {'email': _AUDIT_EMAIL, 'bill_name': 'Elektrik'}, None),
+    ('bill reminder job', 'bills',
+     {'is_paid': False, 'is_notification_enabled': True,
+      '$or': [{'end_date': {'$lte': '2024-01-01'}}, {'end_date': '2024-01-03'}],
+      'last_notification_date': {'$ne': '2024-01-01'},
+      'shard_key': {'$gte': 0, '$lt': 2 ** 31}}, None),
+    ('unpaid-cards', 'credit_cards', {'email': _AUDIT_EMAIL}, [('due_date_end', ASCENDING), ('_id', ASCENDING)]),
+    ('upcoming-payments cards', 'credit_cards',
+     {'email': _AUDIT_EMAIL, 'due_date_end': {'$gte': '2024-01-01', '$lte': '2024-01-31'}}, None),
+    ('update/delete credit-card', 'credit_cards', {'email': _AUDIT_EMAIL, 'bank_name': 'Garanti'}, None),
+    ('recent-expenses', SPENDING_LOGS, {'email': _AUDIT_EMAIL}, [('date', DESCENDING), ('_id', DESCENDING)]),
+    ('budget total', 'spending_totals', {'email': _AUDIT_EMAIL, 'period': 'all', 'category': None}, None),
+    ('spending-summary', 'spending_totals',
+     {'email': _AUDIT_EMAIL, 'period': 'all', 'category': {'$ne': None}, 'count': {'$gt': 0}}, [('total', DESCENDING)]),
+    ('home/messages', SPENDING_LOGS,
+     {'email': _AUDIT_EMAIL, 'date': {'$gte': datetime.datetime(2024, 1, 1), '$lt': datetime.datetime(2024, 2, 1)}},
+     None),
+    ('delete spending-log', SPENDING_LOGS, {'email': _AUDIT_EMAIL, 'category': 'Yemek'}, None),
+]
+
+
+def ensure_indexes(db):
+    """Tanımlı tüm index'leri oluşturur, oluşturulamayanları döndürür"""
+    failed = []
+    ensure_collection(db)
+    # Kullanılmayan saklama modunun koleksiyonu oluşturulmaz
+    inactive = set(STORAGE_COLLECTIONS.values()) - {SPENDING_LOGS}
+    for collection_name, specs in INDEXES.items():
+        if collection_name in inactive:
+            continue
+        for spec in specs:
+            options = {k: v for k, v in spec.items() if k != 'keys'}
+            try:
+                db[collection_name].create_index(spec['keys'], **options)
+            except PyMongoError as e:
+                print(f"Index creation failed for {collection_name}.{spec['name']}: {str(e)}")
+                failed.append((collection_name, spec['name']))
+    return failed
+
+
+def _plan_stages(plan):
+    """Sorgu planındaki tüm aşama isimlerini döndürür"""
+    # Slot tabanlı motorda (MongoDB 7+) plan 'queryPlan' altında gelir
+    if 'queryPlan' in plan:
+        plan = plan['queryPlan']
+    stages = [plan.get('stage')]
+    if 'inputStage' in plan:
+        stages.extend(_plan_stages(plan['inputStage']))
+    for child in plan.get('inputStages', []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def audit_query_plans(db):
+    """Her sorgu şeklinin kazanan planını kontrol eder, COLLSCAN kullananları döndürür"""
+    collscans = []
+    for name, collection_name, query, sort in QUERY_SHAPES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        winning_plan = cursor.explain()['queryPlanner']['winningPlan']
+        # Sharded kümelerde plan shard'lar altında döner
+        plans = [shard['winningPlan'] for shard in winning_plan.get('shards', [])] or [winning_plan]
+        if any('COLLSCAN' in _plan_stages(plan) for plan in plans):
+            collscans.append((name, collection_name))
+    return collscans
@@ -0,0 +1,232 @@
+import atexit
+import datetime
+import os
+import threading
+import time
+from pymongo import UpdateMany, UpdateOne
+from email_templates import create_bill_reminder, create_low_budget_alert
+from extensions import LazyCollection, bills, budgets, data_versions, get_db, get_mail_dispatcher
+from leader import LeaseManager, LeaderScheduler, shard_key, shard_range
+from metrics import observe_job
+
+REMINDER_BATCH_SIZE = 500
+BUDGET_THRESHOLD = 200  # TL cinsinden varsayılan eşik değeri
+FORECAST_BATCH_MONTHS = int(os.getenv('FORECAST_BATCH_MONTHS', 3))
+DAILY = 24 * 3600
+
+# Fatura hatırlatma taraması MONGODB_JOBS_READ_PREFERENCE ile okunur; işaretleme primary'ye yazılır.
+# Bütçe uyarıları primary'den okunur: gecikmeli bir okuma, yükseltilmiş bütçe için uyarı gönderip
+# uyarıyı yeniden kurulamaz hale getirebilirdi.
+job_bills = LazyCollection('bills', 'jobs')
+
+
+def send_email_notification(message):
+    """Mesajı gönderim kuyruğuna ekler; gönderimi arka plandaki worker'lar yapar"""
+    mail_dispatcher = get_mail_dispatcher()
+    if mail_dispatcher is None:
+        print("Email sending failed: email configuration is incomplete")
+        return False
+    try:
+        mail_dispatcher.enqueue(message)
+        return True
+    except Exception as e:
+        print(f"Email sending failed: {str(e)}")
+        return False
+
+
+def run_in_app_context(app, job):
+    """Zamanlanmış işleri Message oluşturabilmeleri için app context içinde çalıştırır"""
+    def wrapper(*args):
+        with app.app_context():
+            return job(*args)
+    wrapper.__name__ = job.__name__
+    return wrapper
+
+
+def _record_bill_notifications(bill_ids, emails, notification_date):
+    """Bildirim gönderilen faturaların tarihini tek bulk_write ile kaydeder"""
+    if bill_ids:
+        bills.bulk_write([UpdateMany(
+            {'_id': {'$in': bill_ids}},
+            {'$set': {'last_notification_date': notification_date}}
+        )], ordered=False)
+        # /unpaid-bills last_notification_date döndürdüğü için ETag'ler yenilenir
+        data_versions.bump_many(emails)
+
+
+def in_shard(query, shard):
+    """shard=(index, shard_sayısı) verilmişse sorguyu o parçanın shard_key aralığıyla sınırlar.
+    shard_key'i olmayan eski belgeler (backfill-shard-keys öncesi) 0 numaralı parçada işlenir."""
+    if shard is None or shard[1] == 1:
+        return query
+    condition = {'shard_key': shard_range(*shard)}
+    if shard[0] == 0:
+        condition = {'$or': [condition, {'shard_key': None}]}
+    return {'$and': [query, condition]}
+
+
+def backfill_shard_keys(collection, batch_size=1000):
+    """shard_key alanı olmayan belgelere e-postadan hesaplanan değeri yazar, güncellenen sayıyı döndürür"""
+    updated = 0
+    operations = []
+    for doc in collection.find({'shard_key': None, 'email': {'$type': 'string'}}, {'email': 1}):
+        operations.append(UpdateOne({'_id': doc['_id']}, {'$set': {'shard_key': shard_key(doc['email'])}}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
+
+
+@observe_job
+def check_and_send_bill_reminders(shard=None):
+    """Fatura ve kredi kartı ödemeleri için hatırlatma e-postaları gönderir"""
+    started = time.perf_counter()
+    current_date = datetime.datetime.now()
+    today = current_date.strftime('%Y-%m-%d')
+    reminder_day = (current_date + datetime.timedelta(days=2)).strftime('%Y-%m-%d')
+
+    # Sadece vadesi geçmiş veya 2 gün sonra dolacak, bugün bildirilmemiş faturalar
+    unpaid_bills = job_bills.find(in_shard({
+        'is_paid': False,
+        'is_notification_enabled': True,
+        '$or': [
+            {'end_date': {'$lte': today}},
+            {'end_date': reminder_day}
+        ],
+        'last_notification_date': {'$ne': today}
+    }, shard), {'email': 1, 'bill_name': 1, 'amount': 1, 'end_date': 1})
+
+    checked = 0
+    sent = 0
+    notified_ids = []
+    notified_emails = set()
+    for bill in unpaid_bills:
+        checked += 1
+        message = create_bill_reminder(
+            bill['email'],
+            bill['bill_name'],
+            bill['amount'],
+            bill['end_date']
+        )
+        if send_email_notification(message):
+            notified_ids.append(bill['_id'])
+            notified_emails.add(bill['email'])
+            sent += 1
+        if len(notified_ids) >= REMINDER_BATCH_SIZE:
+            _record_bill_notifications(notified_ids, notified_emails, today)
+            notified_ids = []
+            notified_emails = set()
+
+    _record_bill_notifications(notified_ids, notified_emails, today)
+
+    duration = time.perf_counter() - started
+    print(f"Bill reminders: {checked} due, {sent} sent, {checked - sent} failed in {duration:.2f}s")
+    return {'checked': checked, 'sent': sent, 'failed': checked - sent, 'duration_seconds': duration}
+
+
+@observe_job
+def run_cash_flow_forecasts():
+    """Tüm kullanıcılar için nakit akışı tahminini tek geçişte hesaplar"""
+    # pandas/numpy yalnızca tahmin çalıştığında yüklenir
+    from forecast import forecast_all_users
+    started = time.perf_counter()
+    count = forecast_all_users(get_db('jobs'), FORECAST_BATCH_MONTHS)
+    print(f"Cash flow forecasts: {count} users in {time.perf_counter() - started:.2f}s")
+    return count
+
+
+@observe_job
+def check_and_send_budget_alerts(shard=None):
+    """Düşük bütçe uyarılarını kontrol eder ve e-posta gönderir"""
+    started = time.perf_counter()
+
+    # Eşik kontrolü veritabanında yapılır; kullanıcıya özel eşik (alert_threshold)
+    # yoksa varsayılan eşik kullanılır, daha önce uyarılan bütçeler atlanır
+    low_budgets = budgets.find(in_shard({
+        'low_budget_alerted_at': None,
+        '$or': [
+            {'alert_threshold': None, 'initial_budget': {'$lt': BUDGET_THRESHOLD}},
+            {'alert_threshold': {'$ne': None}, '$expr': {'$lt': ['$initial_budget', '$alert_threshold']}}
+        ]
+    }, shard), {'email': 1, 'initial_budget': 1, 'alert_threshold': 1})
+
+    checked = 0
+    alerted_ids = []
+    for budget in low_budgets:
+        checked += 1
+        threshold = budget.get('alert_threshold')
+        message = create_low_budget_alert(
+            budget['email'],
+            budget['initial_budget'],
+            BUDGET_THRESHOLD if threshold is None else threshold
+        )
+        if send_email_notification(message):
+            alerted_ids.append(budget['_id'])
+
+    # Uyarı işaretini tek bulk_write ile kaydet; bütçe güncellenince işaret kaldırılır
+    if alerted_ids:
+        budgets.bulk_write([UpdateMany(
+            {'_id': {'$in': alerted_ids}},
+            {'$set': {'low_budget_alerted_at': datetime.datetime.now()}}
+        )], ordered=False)
+
+    duration = time.perf_counter() - started
+    print(f"Budget alerts: {checked} low, {len(alerted_ids)} sent in {duration:.2f}s")
+    return {'checked': checked, 'sent': len(alerted_ids), 'duration_seconds': duration}
+
+
+_scheduler = None
+_leader_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler(app):
+    """Zamanlayıcıyı ilk çağrıda başlatır (SCHEDULER_ENABLED=False ile kapatılabilir).
+    Her süreç lease'leri dener; günlük işleri yalnızca lease sahibi çalıştırır."""
+    global _scheduler, _leader_scheduler
+    if os.getenv('SCHEDULER_ENABLED', 'True') != 'True':
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            lease_ttl = int(os.getenv('SCHEDULER_LEASE_TTL', 60))
+            _leader_scheduler = LeaderScheduler(
+                LeaseManager(LazyCollection('scheduler_leases'), ttl_seconds=lease_ttl),
+                LazyCollection('scheduler_runs'),
+                [
+                    {'name': 'bill_reminders', 'interval_seconds': DAILY, 'sharded': True,
+                     'func': run_in_app_context(app, check_and_send_bill_reminders)},
+                    {'name': 'budget_alerts', 'interval_seconds': DAILY, 'sharded': True,
+                     'func': run_in_app_context(app, check_and_send_budget_alerts)},
+                    {'name': 'cash_flow_forecasts', 'interval_seconds': DAILY, 'sharded': False,
+                     'func': run_cash_flow_forecasts},
+                ],
+                shards=int(os.getenv('SCHEDULER_SHARDS', 1)),
+                max_shards=int(os.getenv('SCHEDULER_MAX_SHARDS', 0)) or None
+            )
+            scheduler = BackgroundScheduler()
+            # Lease'ler süresinin üçte birinde yenilenir; uzun süren bir iş yenilemeyi geciktirmez
+            scheduler.add_job(_leader_scheduler.renew_leases, 'interval', seconds=max(1, lease_ttl // 3),
+                              next_run_time=datetime.datetime.now())
+            scheduler.add_job(_leader_scheduler.run_due_jobs, 'interval',
+                              seconds=int(os.getenv('SCHEDULER_TICK_SECONDS', 60)))
+            scheduler.start()
+            atexit.register(stop_scheduler)
+            _scheduler = scheduler
+    return _scheduler
+
+
+def stop_scheduler():
+    """Zamanlayıcıyı durdurup lease'leri bırakır; başka bir süreç hemen devralabilir"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.shutdown(wait=False)
+            _leader_scheduler.stop()
+            _scheduler = None
+
+
+def scheduler_status():
+    return _leader_scheduler.status() if _leader_scheduler else None
@@ -0,0 +1,213 @@
+import datetime
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+import zlib
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+# Lease belgeleri (scheduler_leases): {_id: isim, owner, expires_at, renewed_at}
+# İş çalıştırma belgeleri (scheduler_runs): {_id: 'iş:shard/shard_sayısı', next_run_at, owner, ...}
+# Süreler sunucu saatiyle ($$NOW) hesaplanır; sunucular arasındaki saat farkı lease'i etkilemez.
+
+
+def default_owner():
+    """Süreci tekil olarak tanımlayan kimlik (host:pid:rastgele)"""
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+# Parçalar shard_key (e-postanın crc32'si) uzayının ardışık aralıklarıdır; fatura ve bütçe belgelerinde
+# saklanan shard_key sayesinde her parça sorgusu yalnızca kendi aralığını index ile tarar
+SHARD_KEY_SPACE = 2 ** 32
+
+
+def shard_key(key):
+    """Anahtarın (ör. e-posta) kararlı hash'i"""
+    return zlib.crc32(key.encode('utf-8'))
+
+
+def shard_of(key, shards):
+    """Anahtarın hangi shard'a düştüğünü döndürür"""
+    return shard_key(key) * shards // SHARD_KEY_SPACE
+
+
+def shard_range(shard, shards):
+    """Parçanın shard_key aralığı (sorgu koşulu olarak)"""
+    return {'$gte': shard * SHARD_KEY_SPACE // shards, '$lt': (shard + 1) * SHARD_KEY_SPACE // shards}
+
+
+def claim(collection, _id, condition, update, marker):
+    """Belge condition'a uyuyorsa update (pipeline) ile günceller, belge yoksa aynı update ile oluşturur.
+    Başarılıysa True döndürür. MongoDB upsert filtresinde $expr kabul etmediğinden iki adımda yapılır:
+    önce koşullu güncelleme (upsert'siz), eşleşmezse yalnızca belge yoksa eşleşen bir upsert
+    (marker alanı mevcut belgelerde hep doludur); belge varsa upsert DuplicateKeyError ile başarısız olur."""
+    if collection.update_one({'_id': _id, **condition}, update).matched_count:
+        return True
+    try:
+        collection.update_one({'_id': _id, marker: None}, update, upsert=True)
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+class LeaseManager:
+    """MongoDB'deki lease belgeleriyle süreçler arası lider seçimi yapar"""
+
+    def __init__(self, collection, owner=None, ttl_seconds=60):
+        self.collection = collection
+        self.owner = owner or default_owner()
+        self.ttl_seconds = ttl_seconds
+        self._deadlines = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name):
+        """Lease boşsa, süresi dolmuşsa veya zaten bizdeyse alır ya da yeniler"""
+        started = time.monotonic()
+        try:
+            # Başkasında ve süresi dolmamışsa ne güncelleme eşleşir ne de belge oluşturulabilir
+            acquired = claim(
+                self.collection, name,
+                {'$or': [{'owner': self.owner}, {'$expr': {'$lt': ['$expires_at', '$$NOW']}}]},
+                [{'$set': {
+                    'owner': {'$literal': self.owner},
+                    'expires_at': {'$add': ['$$NOW', int(self.ttl_seconds * 1000)]},
+                    'renewed_at': '$$NOW'
+                }}],
+                'owner'
+            )
+        except PyMongoError as e:
+            print(f"Lease renewal failed for {name}: {str(e)}")
+            acquired = False
+
+        with self._lock:
+            if acquired:
+                # Yerel süre isteğin başladığı andan sayılır; yenileme başarısız olursa
+                # lease sunucuda dolmadan önce burada da dolmuş olur
+                self._deadlines[name] = started + self.ttl_seconds
+            else:
+                self._deadlines.pop(name, None)
+        return acquired
+
+    def holds(self, name):
+        with self._lock:
+            return self._deadlines.get(name, 0) > time.monotonic()
+
+    def held(self):
+        now = time.monotonic()
+        with self._lock:
+            return sorted(name for name, deadline in self._deadlines.items() if deadline > now)
+
+    def release(self, name):
+        with self._lock:
+            self._deadlines.pop(name, None)
+        try:
+            self.collection.delete_one({'_id': name, 'owner': self.owner})
+        except PyMongoError as e:
+            print(f"Lease release failed for {name}: {str(e)}")
+
+    def release_all(self):
+        for name in self.held():
+            self.release(name)
+
+
+class LeaderScheduler:
+    """Zamanlanmış işleri çok süreçli/çok sunuculu kurulumlarda tek kez çalıştırır.
+
+    Kullanıcı uzayı `shards` parçaya bölünür ve her parça için bir lease tutulur. Varsayılan tek
+    parçada lease'i tutan süreç liderdir. Shard'lı işler (sharded=True) tutulan her parça için
+    ayrı çalışır; shard'sız işleri 0 numaralı parçanın sahibi çalıştırır. Her işin bir sonraki
+    çalışma zamanı scheduler_runs'ta tutulur; lider değişse de iş aralık başına bir kez çalışır."""
+
+    def __init__(self, leases, runs, jobs, shards=1, max_shards=None, retry_seconds=600):
+        self.leases = leases
+        self.runs = runs
+        self.jobs = jobs
+        self.shards = shards
+        self.max_shards = max_shards or shards
+        self.retry_seconds = retry_seconds
+        # Süreçler parçaları farklı sırayla denesin ki max_shards ile yük dağılsın
+        self._offset = random.randrange(shards)
+
+    def lease_name(self, shard):
+        return f'scheduler:{shard}/{self.shards}'
+
+    def held_shards(self):
+        return [shard for shard in range(self.shards) if self.leases.holds(self.lease_name(shard))]
+
+    def renew_leases(self):
+        """Tutulan lease'leri yeniler, boşta kalanları (ölen süreçlerinkiler dahil) almaya çalışır"""
+        held = 0
+        for step in range(self.shards):
+            shard = (self._offset + step) % self.shards
+            name = self.lease_name(shard)
+            if self.leases.holds(name) or held < self.max_shards:
+                if self.leases.acquire(name):
+                    held += 1
+
+    def _claim_run(self, run_id, interval_seconds):
+        """İşin vadesi geldiyse bir sonraki çalışma zamanını ileri alarak çalıştırma hakkını alır"""
+        return claim(
+            self.runs, run_id,
+            {'$expr': {'$lte': ['$next_run_at', '$$NOW']}},
+            [{'$set': {
+                'next_run_at': {'$add': ['$$NOW', int(interval_seconds * 1000)]},
+                'started_at': '$$NOW',
+                'owner': {'$literal': self.leases.owner}
+            }}],
+            'next_run_at'
+        )
+
+    def run_due_jobs(self):
+        """Sahip olunan parçalar için vadesi gelen işleri çalıştırır"""
+        shards = self.held_shards()
+        for job in self.jobs:
+            targets = shards if job.get('sharded') else [0] if 0 in shards else []
+            for shard in targets:
+                # İş sürerken lease kaybedildiyse kalan parçaları yeni sahibine bırak
+                if not self.leases.holds(self.lease_name(shard)):
+                    continue
+                run_id = f"{job['name']}:{shard}/{self.shards}"
+                try:
+                    if not self._claim_run(run_id, job['interval_seconds']):
+                        continue
+                except PyMongoError as e:
+                    print(f"Job claim failed for {run_id}: {str(e)}")
+                    continue
+                self._run(job, run_id, shard)
+
+    def _run(self, job, run_id, shard):
+        started = time.perf_counter()
+        try:
+            if job.get('sharded'):
+                result = job['func']((shard, self.shards))
+            else:
+                result = job['func']()
+            self.runs.update_one({'_id': run_id}, {'$set': {
+                'finished_at': datetime.datetime.now(datetime.timezone.utc),
+                'duration_seconds': time.perf_counter() - started,
+                'result': result if isinstance(result, (dict, int)) else None,
+                'last_error': None
+            }})
+        except Exception as e:
+            print(f"Scheduled job {run_id} failed: {str(e)}")
+            # Başarısız iş bir sonraki tam aralığı beklemeden retry_seconds sonra yeniden denenir
+            self.runs.update_one({'_id': run_id}, [{'$set': {
+                'next_run_at': {'$add': ['$$NOW', int(self.retry_seconds * 1000)]},
+                'last_error': {'$literal': str(e)}
+            }}])
+
+    def status(self):
+        return {
+            'owner': self.leases.owner,
+            'shards': self.shards,
+            'max_shards': self.max_shards,
+            'held_shards': self.held_shards(),
+            'runs': list(self.runs.find({}, {'owner': 1, 'next_run_at': 1, 'started_at': 1, 'finished_at': 1,
+                                             'duration_seconds': 1, 'last_error': 1}))
+        }
+
+    def stop(self):
+        """Lease'leri bırakır; diğer süreçler TTL dolmasını beklemeden devralır"""
+        self.leases.release_all()
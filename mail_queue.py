@@ -0,0 +1,167 @@
+import datetime
+import threading
+from flask_mail import Message
+from pymongo import ReturnDocument
+
+# Kuyruk belgeleri (mail_queue):
+#   {subject, recipients, body, html, sender, status, attempts, available_at, created_at, sent_at, last_error}
+# status 'pending' veya 'sending' olan belgeler available_at zamanı geldiğinde alınır;
+# 'sending' için available_at kilit süresidir, süresi dolan kilit (çöken worker) yeniden alınır.
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+def message_to_document(message):
+    """Flask-Mail Message nesnesini kuyruğa yazılabilir belgeye çevirir"""
+    now = datetime.datetime.utcnow()
+    return {
+        'subject': message.subject,
+        'recipients': list(message.recipients),
+        'body': message.body,
+        'html': message.html,
+        'sender': message.sender,
+        'status': PENDING,
+        'attempts': 0,
+        'available_at': now,
+        'created_at': now
+    }
+
+
+def document_to_message(doc):
+    """Kuyruk belgesinden Message nesnesi oluşturur (app context gerektirir)"""
+    return Message(
+        subject=doc['subject'],
+        recipients=doc['recipients'],
+        body=doc.get('body'),
+        html=doc.get('html'),
+        sender=doc.get('sender')
+    )
+
+
+class MailDispatcher:
+    """E-postaları MongoDB kuyruğundan worker thread'leri ile gönderir"""
+
+    def __init__(self, app, mail, queue, workers=2, batch_size=50, max_attempts=5,
+                 retry_base_seconds=30, lock_seconds=300, poll_seconds=5):
+        self.app = app
+        self.mail = mail
+        self.queue = queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def enqueue(self, message):
+        """Mesajı kalıcı kuyruğa ekler ve worker'ları uyandırır"""
+        self.queue.insert_one(message_to_document(message))
+        self._wakeup.set()
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'mail-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"Mail worker error: {str(e)}")
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+
+    def _claim(self):
+        """Gönderilmeye hazır bir mesajı kilitleyerek alır"""
+        now = datetime.datetime.utcnow()
+        return self.queue.find_one_and_update(
+            {'status': {'$in': [PENDING, SENDING]}, 'available_at': {'$lte': now}},
+            {'$set': {'status': SENDING, 'available_at': now + datetime.timedelta(seconds=self.lock_seconds)},
+             '$inc': {'attempts': 1}},
+            sort=[('available_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _claim_batch(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            doc = self._claim()
+            if doc is None:
+                break
+            batch.append(doc)
+        return batch
+
+    def _mark_sent(self, doc):
+        self.queue.update_one(
+            {'_id': doc['_id']},
+            {'$set': {'status': SENT, 'sent_at': datetime.datetime.utcnow()}, '$unset': {'available_at': ''}}
+        )
+
+    def _mark_failed(self, doc, error):
+        """Mesajı üstel bekleme ile yeniden denemeye bırakır veya kalıcı hata olarak işaretler"""
+        if doc['attempts'] >= self.max_attempts:
+            update = {'$set': {'status': FAILED, 'last_error': error}, '$unset': {'available_at': ''}}
+        else:
+            delay = self.retry_base_seconds * (2 ** (doc['attempts'] - 1))
+            update = {'$set': {
+                'status': PENDING,
+                'available_at': datetime.datetime.utcnow() + datetime.timedelta(seconds=delay),
+                'last_error': error
+            }}
+        self.queue.update_one({'_id': doc['_id']}, update)
+
+    def _release(self, docs):
+        """Gönderilemeden kalan mesajları deneme sayısını geri alarak kuyruğa bırakır"""
+        if docs:
+            self.queue.update_many(
+                {'_id': {'$in': [doc['_id'] for doc in docs]}, 'status': SENDING},
+                {'$set': {'status': PENDING, 'available_at': datetime.datetime.utcnow()},
+                 '$inc': {'attempts': -1}}
+            )
+
+    def drain(self):
+        """Kuyruk boşalana kadar mesajları tek SMTP oturumu üzerinden gönderir, gönderilen sayıyı döndürür"""
+        sent = 0
+        batch = self._claim_batch()
+        if not batch:
+            return sent
+        connected = False
+        with self.app.app_context():
+            try:
+                with self.mail.connect() as connection:
+                    connected = True
+                    while batch:
+                        while batch:
+                            doc = batch.pop(0)
+                            try:
+                                connection.send(document_to_message(doc))
+                            except Exception as e:
+                                # Bağlantı bozulmuş olabilir; oturumu kapatıp kalanları bırak
+                                self._mark_failed(doc, str(e))
+                                raise
+                            self._mark_sent(doc)
+                            sent += 1
+                        batch = self._claim_batch()
+            except Exception as e:
+                print(f"Mail batch failed after {sent} messages: {str(e)}")
+                if connected:
+                    self._release(batch)
+                else:
+                    # SMTP sunucusuna bağlanılamadı; tüm mesajlar beklemeyle yeniden denenir
+                    for doc in batch:
+                        self._mark_failed(doc, str(e))
+        return sent
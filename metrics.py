@@ -0,0 +1,194 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from flask import g, request
+from pymongo import monitoring
+
+# Prometheus metin formatında (text/plain; version=0.0.4) süreç içi metrikler.
+# Değerler süreç başınadır; birden fazla worker varsa her worker ayrı kazınmalıdır.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+JOB_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800, 3600)
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _value(value):
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(list(zip(self.labelnames, key)))} {_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # [bucket başına sayılar..., +Inf], toplam, adet
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                pairs = list(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    le = bound if bound == '+Inf' else _value(bound)
+                    lines.append(f'{self.name}_bucket{_labels(pairs + [("le", le)])} {cumulative}')
+                lines.append(f'{self.name}_sum{_labels(pairs)} {_value(total)}')
+                lines.append(f'{self.name}_count{_labels(pairs)} {count}')
+        return lines
+
+
+def render():
+    """Tüm metrikleri Prometheus metin formatında döndürür"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+http_requests = Counter('http_requests_total', 'HTTP requests by route and status',
+                        ['method', 'route', 'status'])
+http_request_duration = Histogram('http_request_duration_seconds', 'HTTP request latency by route',
+                                  ['method', 'route'])
+mongo_command_duration = Histogram('mongodb_command_duration_seconds', 'MongoDB command latency',
+                                   ['collection', 'command'])
+mongo_command_documents = Counter('mongodb_command_documents_total',
+                                  'Documents returned or affected by MongoDB commands', ['collection', 'command'])
+mongo_command_failures = Counter('mongodb_command_failures_total', 'Failed MongoDB commands',
+                                 ['collection', 'command'])
+job_duration = Histogram('scheduler_job_duration_seconds', 'Scheduled job duration', ['job'], JOB_BUCKETS)
+job_failures = Counter('scheduler_job_failures_total', 'Scheduled job failures', ['job'])
+compression_input_bytes = Counter('http_response_compression_input_bytes_total',
+                                  'Response body bytes before compression', ['route', 'encoding'])
+compression_saved_bytes = Counter('http_response_compression_saved_bytes_total',
+                                  'Response body bytes saved by compression', ['route', 'encoding'])
+
+
+def init_app(app):
+    """Her isteğin süresini ve durum kodunu route şablonu (ör. /bill) bazında kaydeder"""
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # Eşleşmeyen adresler tek etiket altında toplanır, etiket sayısı sınırlı kalır
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            http_request_duration.observe(time.perf_counter() - started, method=request.method, route=route)
+            http_requests.inc(method=request.method, route=route, status=response.status_code)
+        return response
+
+
+def observe_job(job):
+    """Zamanlanmış işin süresini ve hatalarını fonksiyon adıyla kaydeder"""
+    @wraps(job)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return job(*args, **kwargs)
+        except Exception:
+            job_failures.inc(job=job.__name__)
+            raise
+        finally:
+            job_duration.observe(time.perf_counter() - started, job=job.__name__)
+    return wrapper
+
+
+def command_collection(event):
+    if event.command_name == 'getMore':
+        return event.command.get('collection', '')
+    target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else ''
+
+
+def _reply_documents(reply):
+    cursor = reply.get('cursor')
+    if cursor:
+        return len(cursor.get('firstBatch', cursor.get('nextBatch', [])))
+    if 'value' in reply:
+        return 1 if reply['value'] else 0
+    n = reply.get('n')
+    return n if isinstance(n, int) else 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """pymongo komutlarının süresini ve belge sayılarını koleksiyon/işlem bazında kaydeder"""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _finish(self, event):
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), '')
+        mongo_command_duration.observe(event.duration_micros / 1e6, collection=collection,
+                                       command=event.command_name)
+        return collection
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        mongo_command_documents.inc(_reply_documents(event.reply), collection=collection,
+                                    command=event.command_name)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        mongo_command_failures.inc(collection=collection, command=event.command_name)
+
+
+command_listener = CommandMetricsListener()
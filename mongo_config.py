@@ -0,0 +1,54 @@
+import os
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+# MongoDB istemci ayarları. Ortam değişkeni verilmeyen ayarlar için URI'deki değer veya pymongo
+# varsayılanı kullanılır.
+CLIENT_OPTIONS = {
+    # ortam değişkeni: MongoClient parametresi
+    'MONGODB_MAX_POOL_SIZE': 'maxPoolSize',
+    'MONGODB_MIN_POOL_SIZE': 'minPoolSize',
+    'MONGODB_MAX_IDLE_TIME_MS': 'maxIdleTimeMS',
+    'MONGODB_WAIT_QUEUE_TIMEOUT_MS': 'waitQueueTimeoutMS',
+    'MONGODB_SERVER_SELECTION_TIMEOUT_MS': 'serverSelectionTimeoutMS',
+    'MONGODB_CONNECT_TIMEOUT_MS': 'connectTimeoutMS',
+    'MONGODB_SOCKET_TIMEOUT_MS': 'socketTimeoutMS',
+}
+
+READ_PREFERENCES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest,
+}
+
+# Okuma tercihi ayarlanabilen iş yükleri. Bunların dışındaki tüm okumalar ve tüm yazmalar primary'ye
+# gider; yazdığını hemen okuyan yollar (ödeme, ETag ve rapor önbelleği sürümleri) primary'de kalır.
+#   reports   -> /generate_report hesaplamaları
+#   summaries -> /home/messages ve /payments özet sorguları
+#   jobs      -> fatura hatırlatma taraması ve toplu nakit akışı tahmini
+WORKLOADS = ('reports', 'summaries', 'jobs')
+ANALYTICS_READ_PREFERENCE = os.getenv('MONGODB_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+# MongoDB en az 90 saniye kabul eder; bu süreden fazla geride kalan secondary'ler seçilmez
+MAX_STALENESS_SECONDS = int(os.getenv('MONGODB_MAX_STALENESS_SECONDS', 90))
+
+
+def client_options():
+    """Ortam değişkenlerinden MongoClient parametrelerini döndürür"""
+    return {option: int(os.environ[name]) for name, option in CLIENT_OPTIONS.items() if os.getenv(name)}
+
+
+def read_preference(workload):
+    """İş yükünün okuma tercihi: MONGODB_<İŞ YÜKÜ>_READ_PREFERENCE, yoksa MONGODB_ANALYTICS_READ_PREFERENCE"""
+    if workload not in WORKLOADS:
+        raise ValueError(f'Unknown workload: {workload}')
+    mode = os.getenv(f'MONGODB_{workload.upper()}_READ_PREFERENCE', ANALYTICS_READ_PREFERENCE)
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f'Invalid read preference for {workload}: {mode}')
+    if mode == 'primary':
+        return Primary()
+    return READ_PREFERENCES[mode](max_staleness=MAX_STALENESS_SECONDS)
+
+
+def reads_from_primary(workload):
+    return isinstance(read_preference(workload), Primary)
@@ -0,0 +1,61 @@
+import base64
+import datetime
+import json
+from bson import ObjectId
+from bson.errors import InvalidId
+
+ASCENDING = 1
+DESCENDING = -1
+
+
+class InvalidCursor(ValueError):
+    """Çözülemeyen devam (cursor) anahtarı"""
+
+
+def encode_cursor(value, doc_id):
+    """Son kaydın sıralama değeri ve _id'sinden opak devam anahtarı üretir"""
+    if isinstance(value, datetime.datetime):
+        payload = {'v': value.isoformat(), 't': 'dt', 'id': str(doc_id)}
+    else:
+        payload = {'v': value, 'id': str(doc_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token):
+    """Devam anahtarını (sıralama değeri, _id) olarak çözer"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        value = payload['v']
+        if payload.get('t') == 'dt':
+            value = datetime.datetime.fromisoformat(value)
+        return value, ObjectId(payload['id'])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise InvalidCursor('Invalid cursor')
+
+
+def paginate(collection, query, projection, sort_field, direction, limit, cursor=None):
+    """Keyset sayfalama: (sort_field, _id) sırasında cursor'dan sonraki limit kaydı döndürür.
+    Sonuç (kayıtlar, sonraki sayfanın anahtarı veya None) şeklindedir; limit None ise tüm kayıtlar döner.
+    Sayfanın son kaydında sort_field boş (null) ise sonraki sayfa sorgusu eşleşme bulmaz ve sayfalama erken biter."""
+    query = dict(query)
+    if cursor:
+        value, doc_id = decode_cursor(cursor)
+        op = '$gt' if direction == ASCENDING else '$lt'
+        query['$or'] = [
+            {sort_field: {op: value}},
+            {sort_field: value, '_id': {op: doc_id}}
+        ]
+
+    cursor = collection.find(query, projection).sort([(sort_field, direction), ('_id', direction)])
+    if limit is None:
+        return list(cursor), None
+
+    # Bir fazla kayıt okuyarak sonraki sayfanın olup olmadığını anla
+    docs = list(cursor.limit(limit + 1))
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last['_id'])
+    return docs, next_cursor
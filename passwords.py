@@ -0,0 +1,90 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+
+class HasherBusy(Exception):
+    """Şifreleme havuzu ve kuyruğu dolu olduğunda fırlatılır"""
+
+
+def hash_rounds(hashed):
+    """bcrypt özetinden iş faktörünü (cost) okur, ör. $2b$12$... -> 12"""
+    return int(hashed.split('$')[2])
+
+
+class PasswordHasher:
+    """bcrypt işlemlerini sınırlı bir thread havuzunda çalıştırır (bcrypt GIL'i bırakır)"""
+
+    def __init__(self, rounds=12, workers=None, max_queue=32):
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        # Çalışan + kuyrukta bekleyen iş sayısı sınırı
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _submit(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HasherBusy('Password hashing pool is saturated')
+        with self._lock:
+            self._pending += 1
+
+        def done(_):
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+            self._slots.release()
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(done)
+        return future
+
+    def hash(self, password):
+        """Şifreyi yapılandırılmış iş faktörüyle hashler"""
+        hashed = self._submit(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds)).result()
+        return hashed.decode('utf-8')
+
+    def check(self, password, hashed):
+        """Şifrenin kayıtlı özetle eşleşip eşleşmediğini kontrol eder"""
+        return self._submit(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')).result()
+
+    def needs_rehash(self, hashed):
+        """Özet farklı bir iş faktörüyle oluşturulduysa True döndürür"""
+        return hash_rounds(hashed) != self.rounds
+
+    def rehash_in_background(self, password, on_done):
+        """Şifreyi yeni iş faktörüyle arka planda hashler; havuz doluysa atlanır"""
+        try:
+            future = self._submit(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+        except HasherBusy:
+            return False
+
+        def finish(f):
+            try:
+                on_done(f.result().decode('utf-8'))
+            except Exception as e:
+                print(f"Password rehash failed: {str(e)}")
+
+        future.add_done_callback(finish)
+        return True
+
+    def stats(self):
+        """Havuz doluluk bilgilerini döndürür"""
+        with self._lock:
+            pending = self._pending
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': min(pending, self.workers),
+                'queued': max(pending - self.workers, 0),
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'saturation': pending / (self.workers + self.max_queue)
+            }
@@ -0,0 +1,118 @@
+import math
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+PAYMENT_TYPES = ('bill', 'card')
+
+
+class PaymentError(Exception):
+    """Ödeme yapılamadığında fırlatılır; status HTTP durum kodudur"""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def parse_amount(value):
+    """Ödeme tutarını sonlu ve sıfırdan büyük bir sayıya çevirir; negatif tutar bütçeye para eklerdi"""
+    if isinstance(value, bool):
+        raise PaymentError('Payment amount must be a positive number', 400)
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise PaymentError('Payment amount must be a positive number', 400)
+    if not math.isfinite(amount) or amount <= 0:
+        raise PaymentError('Payment amount must be a positive number', 400)
+    return amount
+
+
+def supports_transactions(client):
+    """Bağlantının çok belgeli transaction destekleyip desteklemediğini döndürür (replica set veya mongos)"""
+    hello = client.admin.command('hello')
+    return 'setName' in hello or hello.get('msg') == 'isdbgrid'
+
+
+def _charge_budget(db, email, amount, session=None):
+    """Bütçe yeterliyse tek atomik işlemle düşer, yeni bütçeyi döndürür"""
+    budget = db.budgets.find_one_and_update(
+        {'email': email, 'initial_budget': {'$gte': amount}},
+        {'$inc': {'initial_budget': -amount}},
+        projection={'initial_budget': 1},
+        return_document=ReturnDocument.AFTER,
+        session=session
+    )
+    if budget is None:
+        # Hata nedenini yalnızca başarısız durumda belirle
+        if db.budgets.find_one({'email': email}, {'_id': 1}, session=session):
+            raise PaymentError('Payment amount exceeds available budget', 400)
+        if not db.users.find_one({'email': email}, {'_id': 1}, session=session):
+            raise PaymentError('User not found', 404)
+        raise PaymentError('Budget not found', 404)
+    return budget['initial_budget']
+
+
+def _apply_payment(db, email, payment_type, name, amount, session=None):
+    """Faturayı ödenmiş işaretler veya kart bakiyesini düşer, eski belgeyi döndürür"""
+    if payment_type == 'bill':
+        target = db.bills.find_one_and_update(
+            {'email': email, 'bill_name': name, 'is_paid': False},
+            {'$set': {'is_paid': True}},
+            projection={'_id': 1},
+            session=session
+        )
+        if target is None:
+            raise PaymentError('Unpaid bill not found', 404)
+    else:
+        target = db.credit_cards.find_one_and_update(
+            {'email': email, 'bank_name': name},
+            {'$inc': {'current_balance': -amount}},
+            projection={'_id': 1},
+            session=session
+        )
+        if target is None:
+            raise PaymentError('Credit card not found', 404)
+    return target
+
+
+def _revert_payment(db, payment_type, target, amount):
+    if payment_type == 'bill':
+        db.bills.update_one({'_id': target['_id']}, {'$set': {'is_paid': False}})
+    else:
+        db.credit_cards.update_one({'_id': target['_id']}, {'$inc': {'current_balance': amount}})
+
+
+def make_payment(client, db, email, payment_type, name, amount, use_transactions=True):
+    """Ödemeyi atomik olarak uygular ve kalan bütçeyi döndürür.
+    Transaction destekleniyorsa bütçe ve fatura/kart birlikte değişir; desteklenmiyorsa
+    bütçe koşullu $inc ile düşülür ve başarısızlıkta fatura/kart değişikliği geri alınır."""
+    if payment_type not in PAYMENT_TYPES:
+        raise PaymentError('Invalid payment type', 400)
+    amount = parse_amount(amount)
+
+    if use_transactions:
+        def callback(session):
+            remaining = _charge_budget(db, email, amount, session)
+            _apply_payment(db, email, payment_type, name, amount, session)
+            return remaining
+
+        with client.start_session() as session:
+            try:
+                return session.with_transaction(
+                    callback,
+                    read_concern=ReadConcern('snapshot'),
+                    write_concern=WriteConcern('majority')
+                )
+            except OperationFailure as e:
+                # 20: IllegalOperation (ör. standalone mongod üzerinde transaction)
+                if e.code != 20:
+                    raise
+
+    target = _apply_payment(db, email, payment_type, name, amount)
+    try:
+        return _charge_budget(db, email, amount)
+    except Exception:
+        _revert_payment(db, payment_type, target, amount)
+        raise
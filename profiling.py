@@ -0,0 +1,114 @@
+import contextvars
+import cProfile
+import os
+import re
+import threading
+import time
+from collections import Counter
+from flask import g, request
+from pymongo import monitoring
+from metrics import command_collection
+
+# İstek başına sorgu sayısı ve veritabanı süresi. Her istek için tutulur (N+1 uyarısı için);
+# PROFILING=header|all ise Server-Timing başlığı ve isteğe bağlı cProfile çıktısı da üretilir.
+PROFILE_HEADER = 'X-Profile'
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self, detailed=False):
+        self.detailed = detailed
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.queries = Counter()
+        self.profiler = None
+        self._lock = threading.Lock()
+
+    def add_query(self, collection, command):
+        # run_concurrently ile paralel sorgular aynı profile yazar
+        with self._lock:
+            self.queries[f'{collection}.{command}' if collection else command] += 1
+
+    def add_db_time(self, seconds):
+        with self._lock:
+            self.db_seconds += seconds
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+
+class QueryProfileListener(monitoring.CommandListener):
+    """Komutları, istek sırasında çalışıyorlarsa o isteğin profiline yazar"""
+
+    def started(self, event):
+        profile = _current.get()
+        if profile is not None:
+            profile.add_query(command_collection(event), event.command_name)
+
+    def succeeded(self, event):
+        profile = _current.get()
+        if profile is not None:
+            profile.add_db_time(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        self.succeeded(event)
+
+
+query_listener = QueryProfileListener()
+
+
+def _server_timing(profile, total_seconds):
+    # Paralel sorgularda db süresi toplamdır; uygulama süresi sıfırın altına düşmez
+    app_seconds = max(total_seconds - profile.db_seconds, 0)
+    return (f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.query_count} queries", '
+            f'app;dur={app_seconds * 1000:.1f}, total;dur={total_seconds * 1000:.1f}')
+
+
+def init_app(app):
+    """PROFILING: off (varsayılan), header (yalnızca X-Profile başlıklı istekler) veya all"""
+    mode = app.config['PROFILING']
+    profile_dir = app.config['PROFILE_DIR']
+    threshold = app.config['QUERY_WARNING_THRESHOLD']
+
+    @app.before_request
+    def start_profile():
+        detailed = mode == 'all' or (mode == 'header' and bool(request.headers.get(PROFILE_HEADER)))
+        profile = RequestProfile(detailed)
+        if detailed and profile_dir:
+            profile.profiler = cProfile.Profile()
+            try:
+                profile.profiler.enable()
+            except ValueError:
+                # Aynı thread'de başka bir profiler çalışıyor
+                profile.profiler = None
+        g.request_profile = profile
+        _current.set(profile)
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('request_profile', None)
+        if profile is None:
+            return response
+        total_seconds = time.perf_counter() - profile.started
+        route = request.url_rule.rule if request.url_rule else request.path
+
+        if profile.query_count > threshold:
+            top = ', '.join(f'{name} x{count}' for name, count in profile.queries.most_common(5))
+            print(f"Warning: {request.method} {route} issued {profile.query_count} queries "
+                  f"(threshold {threshold}), possible N+1: {top}")
+
+        if profile.detailed:
+            response.headers['Server-Timing'] = _server_timing(profile, total_seconds)
+            response.headers['X-Query-Count'] = str(profile.query_count)
+        if profile.profiler:
+            profile.profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            name = f"{int(time.time() * 1000)}-{request.method}{re.sub(r'[^A-Za-z0-9-]', '_', route)}.prof"
+            profile.profiler.dump_stats(os.path.join(profile_dir, name))
+        return response
+
+    @app.teardown_request
+    def clear_profile(exc):
+        _current.set(None)
@@ -0,0 +1,95 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+
+# Rapor sürümleri (report_versions) belgeleri:
+#   {_id: email, <report_type>: {'all': n, '<yıl>': n, ...}}
+# Her yazma işlemi etkilediği rapor tipinin ilgili yılının (veya tüm yılların) sayacını artırır.
+# Önbellekteki kayıt, hesaplandığı andaki sayaçlar hâlâ aynıysa geçerlidir; böylece
+# başka bir worker'daki yazma da önbelleği geçersiz kılar.
+ALL_YEARS = 'all'
+
+
+class ReportCache:
+    """Rapor sonuçlarını LRU olarak saklar; geçmiş yıllar süresiz, açık yıllar TTL ile önbelleklenir"""
+
+    def __init__(self, versions, max_entries=1024, open_ttl_seconds=300, closed_ttl_seconds=None):
+        self.versions = versions
+        self.max_entries = max_entries
+        self.open_ttl_seconds = open_ttl_seconds
+        # Raporlar secondary'lerden hesaplanıyorsa gecikmeli veri yeni sürümle saklanabilir;
+        # bu durumda geçmiş yıllar da süreli önbelleklenir
+        self.closed_ttl_seconds = closed_ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _stamp(self, email, report_type, years):
+        doc = self.versions.find_one({'_id': email}, {report_type: 1}) or {}
+        counters = doc.get(report_type, {})
+        return tuple([counters.get(ALL_YEARS, 0)] + [counters.get(str(year), 0) for year in years])
+
+    def get_or_compute(self, email, report_type, year, end_year, granularity, compute):
+        """Geçerli önbellek kaydını döndürür, yoksa compute() ile hesaplayıp saklar"""
+        key = (email, report_type, year, end_year, granularity)
+        stamp = self._stamp(email, report_type, range(year, end_year + 1))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['stamp'] == stamp and (entry['expires_at'] is None or entry['expires_at'] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['value']
+            self.misses += 1
+
+        value = compute()
+        if value is None:
+            return value
+
+        # Kapanmış yılların verisi yalnızca yazma ile değişir, süresiz saklanır
+        closed = end_year < datetime.datetime.now().year
+        if not closed:
+            expires_at = now + self.open_ttl_seconds
+        else:
+            expires_at = now + self.closed_ttl_seconds if self.closed_ttl_seconds else None
+        with self._lock:
+            self._entries[key] = {
+                'value': value,
+                'stamp': stamp,
+                'expires_at': expires_at
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, email, report_type, years=None):
+        """Kullanıcının rapor tipini verilen yıllar (veya tüm yıllar) için geçersiz kılar"""
+        fields = [str(year) for year in years] if years else [ALL_YEARS]
+        self.versions.update_one(
+            {'_id': email},
+            {'$inc': {f'{report_type}.{field}': 1 for field in fields}},
+            upsert=True
+        )
+        with self._lock:
+            self.invalidations += 1
+            for key in [key for key in self._entries if key[0] == email and key[1] == report_type]:
+                if years is None or any(key[2] <= year <= key[3] for year in years):
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
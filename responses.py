@@ -0,0 +1,156 @@
+import zlib
+import orjson
+from bson import Decimal128, ObjectId
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+import metrics
+
+# API yanıt katmanı: orjson ile JSON üretimi ve Accept-Encoding'e göre gzip/brotli sıkıştırma.
+# brotli isteğe bağlıdır (pip install brotli); kurulu değilse yalnızca gzip kullanılır.
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'}
+
+
+def json_default(value):
+    """orjson'un doğrudan yazamadığı MongoDB tipleri; datetime/date zaten ISO 8601 olarak yazılır"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(obj, sort_keys=False, indent=False):
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=json_default, option=option)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify ve request.get_json için orjson kullanan JSON sağlayıcısı"""
+
+    def dumps(self, obj, **kwargs):
+        # Flask'ın kendi kullandığı ek seçenekler (ör. cls) varsa standart kodlayıcıya bırakılır
+        if set(kwargs) - {'sort_keys', 'separators', 'indent'}:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(dumps(obj, self.sort_keys, indent) + b'\n', mimetype=self.mimetype)
+
+
+_brotli = None
+
+
+def _brotli_module():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli
+
+
+def choose_encoding(accept_encodings):
+    """İstemcinin kabul ettiği, en yüksek öncelikli kodlamayı seçer; eşitlikte brotli tercih edilir"""
+    candidates = ['br', 'gzip'] if _brotli_module() else ['gzip']
+    best, best_quality = None, 0
+    for encoding in candidates:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compressor(encoding, gzip_level, brotli_quality):
+    """(process, flush, finish) fonksiyonlarını döndürür; flush o ana kadarki çıktıyı boşaltır"""
+    if encoding == 'br':
+        compressor = _brotli_module().Compressor(quality=brotli_quality)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def compress_body(data, accept_encodings, route, min_size, gzip_level, brotli_quality):
+    """Tamamı hazır bir gövdeyi sıkıştırır (ASGI modu); (gövde, kodlama veya None) döndürür"""
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None or len(data) < min_size:
+        return data, None
+    process, _, finish = _compressor(encoding, gzip_level, brotli_quality)
+    compressed = process(data) + finish()
+    if len(compressed) >= len(data):
+        return data, None
+    _record(route, encoding, len(data), len(compressed))
+    return compressed, encoding
+
+
+def _record(route, encoding, original, compressed):
+    metrics.compression_input_bytes.inc(original, route=route, encoding=encoding)
+    metrics.compression_saved_bytes.inc(original - compressed, route=route, encoding=encoding)
+
+
+def _compress_stream(chunks, encoding, gzip_level, brotli_quality, route):
+    # Dışa aktarma gibi akıtılan yanıtlar parça parça sıkıştırılır; her parça hemen gönderilir
+    process, flush, finish = _compressor(encoding, gzip_level, brotli_quality)
+    original = compressed = 0
+    try:
+        for chunk in chunks:
+            original += len(chunk)
+            data = process(chunk) + flush()
+            compressed += len(data)
+            if data:
+                yield data
+        data = finish()
+        compressed += len(data)
+        yield data
+        _record(route, encoding, original, compressed)
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+
+def init_app(app):
+    """JSON sağlayıcısını değiştirir; COMPRESSION açıksa yanıtları COMPRESS_MIN_SIZE üzerinde sıkıştırır"""
+    app.json = FastJSONProvider(app)
+    if not app.config['COMPRESSION']:
+        return
+    min_size = app.config['COMPRESS_MIN_SIZE']
+    gzip_level = app.config['COMPRESS_LEVEL']
+    brotli_quality = app.config['BROTLI_QUALITY']
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, gzip_level, brotli_quality, route)
+            response.headers.pop('Content-Length', None)
+        else:
+            data, encoding = compress_body(response.get_data(), request.accept_encodings, route,
+                                           min_size, gzip_level, brotli_quality)
+            if encoding is None:
+                return response
+            response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,141 @@
+from pymongo import UpdateOne
+
+# Harcama toplamları (spending_totals) belgeleri:
+#   {email, period, category, total, count}
+# period 'all' (tüm zamanlar) veya 'YYYY-MM'; category None ise tüm kategoriler
+ALL_PERIOD = 'all'
+
+# Yeniden hesaplanan ve kayıtlı toplamlar arasında kabul edilen fark
+DRIFT_TOLERANCE = 0.01
+
+
+def period_of(date):
+    """Harcama tarihinin ait olduğu ay dönemini döndürür"""
+    return date.strftime('%Y-%m')
+
+
+def spending_deltas(email, category, amount, period, count=1, deltas=None):
+    """Bir harcama değişikliğinin etkilediği tüm toplamlar için farkları biriktirir"""
+    if deltas is None:
+        deltas = {}
+    for key in [(email, ALL_PERIOD, None), (email, ALL_PERIOD, category),
+                (email, period, None), (email, period, category)]:
+        total, total_count = deltas.get(key, (0, 0))
+        deltas[key] = (total + amount, total_count + count)
+    return deltas
+
+
+def apply_deltas(totals, deltas, session=None):
+    """Farkları tek bir bulk_write ile atomik $inc olarak uygular"""
+    if not deltas:
+        return
+    operations = [
+        UpdateOne(
+            {'email': email, 'period': period, 'category': category},
+            {'$inc': {'total': amount, 'count': count}},
+            upsert=True
+        )
+        for (email, period, category), (amount, count) in deltas.items()
+    ]
+    totals.bulk_write(operations, ordered=False, session=session)
+
+
+def record_spending(totals, email, category, amount, date, session=None):
+    """Yeni bir harcamayı toplamlara ekler"""
+    apply_deltas(totals, spending_deltas(email, category, amount, period_of(date)), session)
+
+
+def remove_spending(totals, logs, query, session=None):
+    """Sorguya uyan harcamaları siler ve toplamlardan düşer, silinen kayıt sayısını döndürür"""
+    # Aggregation ile silme arasında eklenen kayıtları etkilememek için tarih sınırı
+    cutoff = max((log['date'] for log in logs.find(query, {'date': 1}, session=session).sort('date', -1).limit(1)),
+                 default=None)
+    if cutoff is None:
+        return 0
+    query = dict(query, date={'$lte': cutoff})
+
+    deltas = {}
+    for item in _aggregate_logs(logs, query, session):
+        key = item['_id']
+        spending_deltas(key['email'], key['category'], -item['total'], key['period'],
+                        count=-item['count'], deltas=deltas)
+
+    result = logs.delete_many(query, session=session)
+    apply_deltas(totals, deltas, session)
+    totals.delete_many({'email': query['email'], 'count': {'$lte': 0}}, session=session)
+    return result.deleted_count
+
+
+def get_user_total(totals, email):
+    """Kullanıcının tüm zamanlardaki toplam harcamasını döndürür"""
+    doc = totals.find_one({'email': email, 'period': ALL_PERIOD, 'category': None}, {'total': 1})
+    return doc['total'] if doc else 0
+
+
+def get_category_totals(totals, email, period=ALL_PERIOD):
+    """Kullanıcının kategori toplamlarını büyükten küçüğe döndürür"""
+    return list(totals.find(
+        {'email': email, 'period': period, 'category': {'$ne': None}, 'count': {'$gt': 0}},
+        {'_id': 0, 'category': 1, 'total': 1}
+    ).sort('total', -1))
+
+
+def _aggregate_logs(logs, query, session=None):
+    """Ham harcama kayıtlarını kullanıcı, ay ve kategori bazında toplar"""
+    pipeline = [
+        {'$match': query},
+        {'$group': {
+            '_id': {
+                'email': '$email',
+                'period': {'$dateToString': {'format': '%Y-%m', 'date': '$date'}},
+                'category': '$category'
+            },
+            'total': {'$sum': '$amount'},
+            'count': {'$sum': 1}
+        }}
+    ]
+    return logs.aggregate(pipeline, allowDiskUse=True, session=session)
+
+
+def compute_rollups(logs, email=None):
+    """Toplamları ham harcama kayıtlarından baştan hesaplar"""
+    deltas = {}
+    for item in _aggregate_logs(logs, {'email': email} if email else {}):
+        key = item['_id']
+        spending_deltas(key['email'], key['category'], item['total'], key['period'],
+                        count=item['count'], deltas=deltas)
+    return deltas
+
+
+def rebuild_rollups(totals, logs, email=None):
+    """Toplamları ham kayıtlardan yeniden oluşturur, yazılan belge sayısını döndürür"""
+    deltas = compute_rollups(logs, email)
+    totals.delete_many({'email': email} if email else {})
+    docs = [
+        {'email': key_email, 'period': period, 'category': category, 'total': amount, 'count': count}
+        for (key_email, period, category), (amount, count) in deltas.items()
+    ]
+    if docs:
+        totals.insert_many(docs, ordered=False)
+    return len(docs)
+
+
+def verify_rollups(totals, logs, email=None):
+    """Kayıtlı toplamları ham kayıtlarla karşılaştırır, farklı olanları döndürür"""
+    expected = compute_rollups(logs, email)
+    stored = {
+        (doc['email'], doc['period'], doc.get('category')): (doc['total'], doc['count'])
+        for doc in totals.find({'email': email} if email else {})
+        if doc['count'] > 0
+    }
+    mismatches = []
+    for key in set(expected) | set(stored):
+        expected_total, expected_count = expected.get(key, (0, 0))
+        stored_total, stored_count = stored.get(key, (0, 0))
+        if expected_count != stored_count or abs(expected_total - stored_total) > DRIFT_TOLERANCE:
+            mismatches.append({
+                'key': key,
+                'expected': (expected_total, expected_count),
+                'stored': (stored_total, stored_count)
+            })
+    return mismatches
@@ -0,0 +1,168 @@
+import csv
+import datetime
+import json
+import math
+from pymongo.errors import BulkWriteError
+from rollups import spending_deltas, apply_deltas, period_of
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Yanıtta döndürülecek en fazla satır hatası (bellek sınırı için)
+MAX_REPORTED_ERRORS = 100
+
+
+class RowError(ValueError):
+    """Geçersiz içe aktarma satırı"""
+
+
+class InvalidFile(ValueError):
+    """Dosyanın geri kalanı okunamıyor (ör. UTF-8 olmayan içerik, bozuk CSV); row hatanın satır numarasıdır"""
+
+    def __init__(self, message, row):
+        super().__init__(message)
+        self.row = row
+
+
+def _decode_lines(stream):
+    # Satırlar tek tek çözülür; bozuk bayt içeren ilk satırda okuma durur (önceki satırlar işlenmiş olur)
+    for line in stream:
+        try:
+            yield line.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise InvalidFile('File is not valid UTF-8', None)
+
+
+def _parse_lines(lines, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield RowError('Invalid JSON')
+            continue
+        yield row if isinstance(row, dict) else RowError('Row must be a JSON object')
+
+
+def read_rows(stream, fmt):
+    """İkili akıştan satırları tek tek okuyan generator (dosya belleğe alınmaz).
+    Okunamayan içerikte, hatalı satırın numarasıyla InvalidFile fırlatır."""
+    row_number = 0
+    try:
+        for row in _parse_lines(_decode_lines(stream), fmt):
+            row_number += 1
+            yield row
+    except (InvalidFile, csv.Error) as e:
+        message = str(e) if isinstance(e, InvalidFile) else f'Invalid CSV: {e}'
+        raise InvalidFile(message, row_number + 1)
+
+
+def _parse_amount(value):
+    if isinstance(value, str):
+        value = value.strip().replace(' ', '')
+        # Ondalık ayırıcı olarak virgül (ör. 150,75)
+        if ',' in value and '.' not in value:
+            value = value.replace(',', '.')
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise RowError('Invalid amount')
+    if not math.isfinite(amount):
+        raise RowError('Invalid amount')
+    return amount
+
+
+def _parse_date(value, default):
+    if value in (None, ''):
+        return default
+    try:
+        date = datetime.datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise RowError('Invalid date, expected YYYY-MM-DD')
+    # Diğer kayıtlar (datetime.now()) gibi saat dilimsiz sunucu yerel saati olarak saklanır
+    if date.tzinfo is not None:
+        date = date.astimezone().replace(tzinfo=None)
+    return date
+
+
+def normalize_row(row, email, default_date):
+    """Satırı doğrular ve spending_logs belgesine çevirir"""
+    if isinstance(row, RowError):
+        raise row
+    category = row.get('category')
+    if not isinstance(category, str) or not category.strip():
+        raise RowError('Category is required')
+    if row.get('amount') in (None, ''):
+        raise RowError('Amount is required')
+    return {
+        'email': email,
+        'category': category.strip(),
+        'amount': _parse_amount(row['amount']),
+        'date': _parse_date(row.get('date'), default_date)
+    }
+
+
+def _insert_batch(logs, batch, deltas):
+    """Kayıtları sırasız toplu ekler, yalnızca eklenenleri toplam farklarına yansıtır.
+    batch: (satır numarası, belge) listesi; eklenemeyen satırları (numara, hata) olarak döndürür"""
+    try:
+        logs.insert_many([doc for _, doc in batch], ordered=False)
+        failed = {}
+    except BulkWriteError as e:
+        failed = {error['index']: error.get('errmsg', 'Write failed') for error in e.details.get('writeErrors', [])}
+    for index, (_, doc) in enumerate(batch):
+        if index not in failed:
+            spending_deltas(doc['email'], doc['category'], doc['amount'], period_of(doc['date']), deltas=deltas)
+    return [(batch[index][0], message) for index, message in failed.items()]
+
+
+def import_spending_logs(logs, totals, email, rows, batch_size=1000):
+    """Satırları doğrulayıp toplu ekler; harcama toplamlarını sonunda tek seferde günceller.
+    Dosya okunamaz hale gelirse o ana kadar doğrulanan satırlar yazılır ve sonuçta 'error' döner."""
+    default_date = datetime.datetime.now()
+    inserted = 0
+    failed = 0
+    errors = []
+    deltas = {}
+    batch = []
+    file_error = None
+
+    def report(row_number, message):
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': row_number, 'error': message})
+
+    def flush():
+        nonlocal inserted, failed
+        write_errors = _insert_batch(logs, batch, deltas)
+        inserted += len(batch) - len(write_errors)
+        failed += len(write_errors)
+        for row_number, message in write_errors:
+            report(row_number, message)
+        batch.clear()
+
+    try:
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                batch.append((row_number, normalize_row(row, email, default_date)))
+            except RowError as e:
+                failed += 1
+                report(row_number, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush()
+    except InvalidFile as e:
+        file_error = {'row': e.row, 'error': str(e)}
+
+    if batch:
+        flush()
+
+    apply_deltas(totals, deltas)
+    result = {'inserted': inserted, 'failed': failed, 'errors': errors}
+    if file_error:
+        result['error'] = f"Row {file_error['row']}: {file_error['error']}"
+        result['errors'].append(file_error)
+    return result
@@ -0,0 +1,117 @@
+import datetime
+import os
+from pymongo.errors import BulkWriteError, CollectionInvalid
+
+# Harcama kayıtlarının saklama modu (SPENDING_STORAGE):
+#   documents  -> her harcama 'spending_logs' içinde ayrı bir belge (varsayılan)
+#   timeseries -> 'spending_log_series' time-series koleksiyonu; MongoDB kayıtları kullanıcı
+#                 (metaField=email) ve zaman aralığı başına sıkıştırılmış kovalarda saklar
+# Alan adları (email, category, amount, date) iki modda da aynıdır; endpoint sorguları değişmeden
+# aktif koleksiyonu okur. time-series için MongoDB 5.0+, kategoriye göre silme
+# (DELETE /spending-log) için 7.0+ gerekir.
+STORAGE_COLLECTIONS = {'documents': 'spending_logs', 'timeseries': 'spending_log_series'}
+STORAGE_MODE = os.getenv('SPENDING_STORAGE', 'documents')
+SPENDING_LOGS = STORAGE_COLLECTIONS[STORAGE_MODE]
+# Geçişlerin kaynak tarafı ilerleme noktaları: {_id: 'kaynak->hedef', last_id, copied, updated_at}
+MIGRATION_STATE = 'spending_migrations'
+
+# Bir kullanıcının harcamaları seyrek olduğundan saat ayrıntısı (kova başına 30 güne kadar) seçilir
+TIMESERIES_OPTIONS = {'timeField': 'date', 'metaField': 'email', 'granularity': 'hours'}
+
+
+def is_timeseries(db, name):
+    info = next(db.list_collections(filter={'name': name}), None)
+    return info is not None and info.get('type') == 'timeseries'
+
+
+def ensure_collection(db, mode=STORAGE_MODE):
+    """time-series koleksiyonunu ilk kullanımdan önce oluşturur.
+    (Index oluşturmak veya ilk insert koleksiyonu normal koleksiyon olarak yaratırdı.)"""
+    if mode != 'timeseries':
+        return
+    name = STORAGE_COLLECTIONS[mode]
+    if name in db.list_collection_names(filter={'name': name}):
+        if not is_timeseries(db, name):
+            raise RuntimeError(f'{name} exists but is not a time series collection')
+        return
+    try:
+        db.create_collection(name, timeseries=TIMESERIES_OPTIONS)
+    except CollectionInvalid:
+        # Başka bir süreç aynı anda oluşturdu
+        pass
+
+
+def migrate(db, target_mode, batch_size=5000, resume=True):
+    """Harcamaları diğer moddaki koleksiyondan hedef moda kopyalar, kopyalanan kayıt sayısını döndürür.
+    Kaynak silinmez. Kopyalanan son kaynak _id'si spending_migrations'a yazılır; resume=True ise
+    bu noktadan devam edilir. Kesilen bir geçişi sürdürmek veya mod değiştirildikten sonra aradaki
+    kayıtları almak için tekrar çalıştırılabilir (hedefe doğrudan yazılan yeni kayıtlar etkilemez)."""
+    source_mode = 'documents' if target_mode == 'timeseries' else 'timeseries'
+    source = db[STORAGE_COLLECTIONS[source_mode]]
+    ensure_collection(db, target_mode)
+    target = db[STORAGE_COLLECTIONS[target_mode]]
+    state_id = f'{source.name}->{target.name}'
+
+    query = {}
+    if resume:
+        state = db[MIGRATION_STATE].find_one({'_id': state_id})
+        if state:
+            query = {'_id': {'$gt': state['last_id']}}
+
+    copied = 0
+    batch = []
+    cursor = source.find(query).sort('_id', 1).batch_size(batch_size).allow_disk_use(True)
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            copied += _copy_batch(db, state_id, target, batch, target_mode == 'timeseries')
+            batch = []
+    if batch:
+        copied += _copy_batch(db, state_id, target, batch, target_mode == 'timeseries')
+    return copied
+
+
+def _copy_batch(db, state_id, target, batch, dedupe):
+    # time-series koleksiyonları _id tekilliği uygulamaz; kesilen bir geçişte yazılmış kayıtlar
+    # (aynı _id) tekrar eklenmemesi için önce aranır
+    if dedupe:
+        existing = {doc['_id'] for doc in target.find({
+            'email': {'$in': list({doc['email'] for doc in batch})},
+            'date': {'$gte': min(doc['date'] for doc in batch), '$lte': max(doc['date'] for doc in batch)},
+            '_id': {'$in': [doc['_id'] for doc in batch]}
+        }, {'_id': 1})}
+        docs = [doc for doc in batch if doc['_id'] not in existing]
+    else:
+        docs = batch
+
+    inserted = 0
+    if docs:
+        try:
+            inserted = len(target.insert_many(docs, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            # Normal koleksiyonda zaten bulunan kayıtlar (duplicate key) atlanır
+            if any(error['code'] != 11000 for error in e.details.get('writeErrors', [])):
+                raise
+            inserted = e.details.get('nInserted', 0)
+
+    # Kaynak tarafı ilerleme noktası, kayıtlar yazıldıktan sonra kaydedilir
+    db[MIGRATION_STATE].update_one(
+        {'_id': state_id},
+        {'$set': {'last_id': batch[-1]['_id'], 'updated_at': datetime.datetime.now()}, '$inc': {'copied': inserted}},
+        upsert=True
+    )
+    return inserted
+
+
+def storage_stats(db, name):
+    """Koleksiyonun belge, veri, disk ve index boyutlarını döndürür"""
+    stats = next(db[name].aggregate([{'$collStats': {'storageStats': {}}}]))['storageStats']
+    return {
+        'collection': name,
+        'timeseries': 'timeseries' in stats,
+        # time-series koleksiyonlarında tahmini sayım kova sayısını verebilir
+        'documents': db[name].count_documents({}),
+        'size_bytes': stats.get('size', 0),
+        'storage_bytes': stats.get('storageSize', 0),
+        'index_bytes': stats.get('totalIndexSize', 0)
+    }
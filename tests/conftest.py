@@ -0,0 +1,53 @@
+import os
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+# Veritabanı gerektiren testler MONGODB_TEST_URI ile verilen replica set'e karşı çalışır, verilmezse atlanır:
+#   MONGODB_TEST_URI="mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0" pytest
+# Uygulama ayarları import sırasında okunduğu için ortam değişkenleri burada, uygulama import edilmeden önce verilir.
+TEST_URI = os.getenv('MONGODB_TEST_URI')
+TEST_DATABASE = 'finance_test'
+
+os.environ['MONGODB_DATABASE'] = TEST_DATABASE
+os.environ['BACKGROUND_SERVICES'] = 'False'
+os.environ['SCHEDULER_ENABLED'] = 'False'
+if TEST_URI:
+    os.environ['MONGODB_URI'] = TEST_URI
+else:
+    # Veritabanına erişen bir test yanlışlıkla çalışırsa uzun süre beklemesin
+    os.environ.setdefault('MONGODB_SERVER_SELECTION_TIMEOUT_MS', '1000')
+
+
+@pytest.fixture(scope='session')
+def replica_set():
+    """Replica set'e bağlı istemci; replica set yoksa testi atlar"""
+    if not TEST_URI:
+        pytest.skip('MONGODB_TEST_URI is not set')
+    client = MongoClient(TEST_URI, serverSelectionTimeoutMS=3000)
+    try:
+        hello = client.admin.command('hello')
+    except PyMongoError as e:
+        pytest.skip(f'MongoDB is not reachable: {e}')
+    if 'setName' not in hello:
+        pytest.skip('MONGODB_TEST_URI is not a replica set')
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def db(replica_set):
+    replica_set.drop_database(TEST_DATABASE)
+    yield replica_set[TEST_DATABASE]
+    replica_set.drop_database(TEST_DATABASE)
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+    return create_app({'TESTING': True, 'BACKGROUND_SERVICES': False})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
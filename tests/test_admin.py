@@ -0,0 +1,23 @@
+import pytest
+
+OPS_PATHS = ['/password-hasher/stats', '/report-cache/stats', '/metrics']
+REMOTE = {'REMOTE_ADDR': '203.0.113.7'}
+
+
+@pytest.mark.parametrize('path', OPS_PATHS)
+def test_ops_endpoints_allow_loopback_without_token(client, path):
+    assert client.get(path).status_code == 200
+
+
+@pytest.mark.parametrize('path', OPS_PATHS + ['/scheduler/status'])
+def test_ops_endpoints_reject_remote_without_token(client, path):
+    assert client.get(path, environ_base=REMOTE).status_code == 403
+
+
+@pytest.mark.parametrize('path', OPS_PATHS)
+def test_ops_endpoints_require_token_when_configured(app, client, monkeypatch, path):
+    monkeypatch.setitem(app.config, 'OPS_TOKEN', 'secret')
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get(path, headers={'Authorization': 'Bearer secret'}, environ_base=REMOTE)
+    assert response.status_code == 200
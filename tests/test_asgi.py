@@ -0,0 +1,93 @@
+import asyncio
+import datetime
+import json
+import pytest
+from asgi import AsgiApp
+
+EMAIL = 'async@example.com'
+HEADERS = {'X-User-Email': EMAIL}
+ASYNC_PATHS = ['/upcoming-payments', '/payments', '/home/messages']
+
+
+@pytest.fixture
+def asgi_app(app):
+    application = AsgiApp(app, workers=4)
+    yield application
+    application.databases.close()
+    application.executor.shutdown()
+
+
+async def _call(application, method, path, headers=None, body=b'', client=('127.0.0.1', 50000)):
+    """İsteği ASGI uygulamasına doğrudan verir; (durum, başlıklar, gövde) döndürür"""
+    scope = {'type': 'http', 'http_version': '1.1', 'method': method, 'path': path, 'root_path': '',
+             'query_string': b'', 'scheme': 'http', 'server': ('testserver', 80), 'client': client,
+             'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                         for name, value in (headers or {}).items()]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    start = messages[0]
+    assert start['type'] == 'http.response.start'
+    assert not messages[-1].get('more_body')
+    return (start['status'], {name.decode('latin-1'): value.decode('latin-1') for name, value in start['headers']},
+            b''.join(message.get('body', b'') for message in messages[1:]))
+
+
+def _request(application, *args, **kwargs):
+    return asyncio.run(_call(application, *args, **kwargs))
+
+
+def test_delegated_route_matches_flask(asgi_app, client):
+    body = {'report_type': 'monthly_balance', 'email': EMAIL, 'year': 'abc'}
+    status, headers, data = _request(asgi_app, 'POST', '/generate_report', {'Content-Type': 'application/json'},
+                                     json.dumps(body).encode('utf-8'))
+    expected = client.post('/generate_report', json=body)
+    assert status == expected.status_code == 400
+    assert headers['content-type'] == 'application/json'
+    assert data == expected.get_data()
+
+
+def test_delegated_route_sees_client_address(asgi_app):
+    assert _request(asgi_app, 'GET', '/metrics')[0] == 200
+    assert _request(asgi_app, 'GET', '/metrics', client=('203.0.113.7', 50000))[0] == 403
+
+
+@pytest.mark.parametrize('path', ['/upcoming-payments', '/payments'])
+def test_async_routes_require_user(asgi_app, client, path):
+    status, headers, data = _request(asgi_app, 'GET', path, {'Origin': 'http://localhost:3000'})
+    expected = client.get(path, headers={'Origin': 'http://localhost:3000'})
+    assert status == expected.status_code == 401
+    assert json.loads(data) == expected.get_json()
+    assert headers['access-control-allow-origin'] == expected.headers['Access-Control-Allow-Origin']
+
+
+def test_async_routes_match_flask(asgi_app, client, db):
+    pytest.importorskip('motor')
+    today = datetime.date.today()
+    db.budgets.insert_one({'email': EMAIL, 'initial_budget': 1000})
+    db.spending_logs.insert_one({'email': EMAIL, 'category': 'Spor', 'amount': 400.0,
+                                 'date': datetime.datetime.now()})
+    db.credit_cards.insert_one({'email': EMAIL, 'bank_name': 'Garanti', 'card_limit': 10000,
+                                'due_date_start': today.isoformat(),
+                                'due_date_end': (today + datetime.timedelta(days=5)).isoformat(),
+                                'current_balance': 500})
+    db.bills.insert_many([
+        {'email': EMAIL, 'bill_name': name, 'amount': 120, 'is_paid': is_paid, 'category': 'Elektrik',
+         'end_date': (today + datetime.timedelta(days=3)).isoformat()}
+        for name, is_paid in [('Elektrik', True), ('Su', False)]
+    ])
+
+    # motor istemcisi oluşturulduğu event loop'a bağlı olduğundan istekler aynı loop'ta gönderilir
+    async def call_all():
+        return [await _call(asgi_app, 'GET', path, HEADERS) for path in ASYNC_PATHS]
+
+    for path, (status, headers, data) in zip(ASYNC_PATHS, asyncio.run(call_all())):
+        expected = client.get(path, headers=HEADERS)
+        assert status == expected.status_code == 200
+        assert json.loads(data) == expected.get_json()
@@ -0,0 +1,17 @@
+import pytest
+
+EMAIL = 'saver@example.com'
+
+
+@pytest.mark.parametrize('threshold', [-1, 'abc', '500', True, [500]])
+def test_set_budget_rejects_invalid_alert_threshold(client, threshold):
+    response = client.post('/budget', json={'email': EMAIL, 'initial_budget': 1000, 'alert_threshold': threshold})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('threshold, stored', [(0, 0), (750.5, 750.5), (None, None)])
+def test_set_budget_stores_alert_threshold(client, db, threshold, stored):
+    db.users.insert_one({'username': 'saver', 'email': EMAIL, 'password': 'x'})
+    response = client.post('/budget', json={'email': EMAIL, 'initial_budget': 1000, 'alert_threshold': threshold})
+    assert response.status_code == 201
+    assert db.budgets.find_one({'email': EMAIL})['alert_threshold'] == stored
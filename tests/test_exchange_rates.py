@@ -0,0 +1,40 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from exchange_rates import RateProvider
+
+RATES = {'base_code': 'USD', 'time_last_update_utc': 'Mon, 01 Jan 2024 00:00:01 +0000', 'rates': {'TRY': 30.0}}
+
+
+class SlowBackend:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        if self.fail:
+            raise OSError('upstream down')
+        return RATES
+
+
+def test_cold_cache_fetches_upstream_once():
+    backend = SlowBackend()
+    provider = RateProvider(backend)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: provider.get(), range(10)))
+    assert backend.calls == 1
+    assert all(result['rates'] == {'TRY': 30.0} for result in results)
+
+
+def test_cold_cache_failure_opens_circuit():
+    backend = SlowBackend(fail=True)
+    provider = RateProvider(backend, failure_threshold=3)
+    for _ in range(5):
+        with pytest.raises(RuntimeError):
+            provider.get()
+    assert backend.calls == 3
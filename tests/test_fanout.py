@@ -0,0 +1,31 @@
+import threading
+import time
+import pytest
+import extensions
+from extensions import run_concurrently
+
+
+def test_run_concurrently_overlaps_calls_and_keeps_order():
+    started = time.perf_counter()
+    results = run_concurrently(lambda: time.sleep(0.2) or 'cards', lambda: time.sleep(0.2) or 'bills')
+    assert results == ['cards', 'bills']
+    assert time.perf_counter() - started < 0.35
+
+
+def test_run_concurrently_runs_first_call_on_the_calling_thread():
+    threads = run_concurrently(threading.current_thread, threading.current_thread)
+    assert threads[0] is threading.current_thread()
+    assert threads[1] is not threading.current_thread()
+
+
+def test_run_concurrently_serial_mode(monkeypatch):
+    monkeypatch.setattr(extensions, 'QUERY_FANOUT', False)
+    threads = run_concurrently(threading.current_thread, threading.current_thread)
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_run_concurrently_propagates_errors():
+    def fail():
+        raise ValueError('query failed')
+    with pytest.raises(ValueError):
+        run_concurrently(lambda: 1, fail)
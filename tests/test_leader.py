@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from leader import LeaseManager, LeaderScheduler
+
+LEASE = 'scheduler:0/1'
+
+
+def test_only_one_process_acquires_a_lease(db):
+    managers = [LeaseManager(db.scheduler_leases, owner=f'process-{i}', ttl_seconds=60) for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda manager: manager.acquire(LEASE), managers))
+
+    assert results.count(True) == 1
+    winner = managers[results.index(True)]
+    assert db.scheduler_leases.find_one({'_id': LEASE})['owner'] == winner.owner
+    # Sahibi yenileyebilir, diğerleri alamaz
+    assert winner.acquire(LEASE) and winner.holds(LEASE)
+    assert not any(manager.acquire(LEASE) for manager in managers if manager is not winner)
+
+
+def test_lease_is_taken_over_after_expiry(db):
+    first = LeaseManager(db.scheduler_leases, owner='first', ttl_seconds=1)
+    second = LeaseManager(db.scheduler_leases, owner='second', ttl_seconds=1)
+    assert first.acquire(LEASE)
+    assert not second.acquire(LEASE)
+
+    time.sleep(1.5)
+    assert not first.holds(LEASE)
+    assert second.acquire(LEASE)
+    assert not first.acquire(LEASE)
+    assert db.scheduler_leases.find_one({'_id': LEASE})['owner'] == 'second'
+
+
+def test_released_lease_can_be_acquired_immediately(db):
+    first = LeaseManager(db.scheduler_leases, owner='first', ttl_seconds=60)
+    second = LeaseManager(db.scheduler_leases, owner='second', ttl_seconds=60)
+    assert first.acquire(LEASE)
+    first.release(LEASE)
+    assert second.acquire(LEASE)
+
+
+def test_job_runs_once_per_interval(db):
+    leases = LeaseManager(db.scheduler_leases, owner='leader')
+    scheduler = LeaderScheduler(leases, db.scheduler_runs, jobs=[])
+    assert scheduler._claim_run('job:0/1', 1)
+    assert not scheduler._claim_run('job:0/1', 1)
+
+    time.sleep(1.5)
+    assert scheduler._claim_run('job:0/1', 1)
+
+
+def test_run_due_jobs_runs_each_job_once_across_schedulers(db):
+    calls = []
+    jobs = [{'name': 'reminders', 'func': lambda shard: calls.append(shard), 'interval_seconds': 3600,
+             'sharded': True}]
+    schedulers = [LeaderScheduler(LeaseManager(db.scheduler_leases, owner=f'process-{i}'), db.scheduler_runs,
+                                  jobs, shards=2) for i in range(3)]
+    for _ in range(2):
+        for scheduler in schedulers:
+            scheduler.renew_leases()
+            scheduler.run_due_jobs()
+
+    assert sorted(calls) == [(0, 2), (1, 2)]
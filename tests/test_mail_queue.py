@@ -0,0 +1,120 @@
+import datetime
+import pytest
+from flask_mail import Message
+from mail_queue import MailDispatcher, PENDING, SENT, FAILED
+
+
+class FakeConnection:
+    def __init__(self, mail):
+        self.mail = mail
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, message):
+        if message.subject in self.mail.fail_subjects:
+            raise OSError(f'Rejected {message.subject}')
+        self.mail.sent.append(message.subject)
+
+
+class FakeMail:
+    """Flask-Mail yerine geçen, gönderilenleri kaydeden SMTP taklidi"""
+
+    def __init__(self, connect_error=None, fail_subjects=()):
+        self.connect_error = connect_error
+        self.fail_subjects = set(fail_subjects)
+        self.connections = 0
+        self.sent = []
+
+    def connect(self):
+        self.connections += 1
+        if self.connect_error:
+            raise self.connect_error
+        return FakeConnection(self)
+
+
+@pytest.fixture
+def queue(db):
+    return db.mail_queue
+
+
+def _dispatcher(app, mail, queue, **options):
+    return MailDispatcher(app, mail, queue, workers=0, **options)
+
+
+def _enqueue(app, dispatcher, *subjects):
+    with app.app_context():
+        for subject in subjects:
+            dispatcher.enqueue(Message(subject=subject, recipients=['a@example.com'], body='x',
+                                       sender='noreply@example.com'))
+    # Aynı milisaniyede eklenen mesajların alınma sırası belirsizdir; sırayı sabitle
+    now = datetime.datetime.utcnow()
+    for index, subject in enumerate(subjects):
+        dispatcher.queue.update_one({'subject': subject},
+                                    {'$set': {'available_at': now - datetime.timedelta(seconds=len(subjects) - index)}})
+
+
+def _doc(queue, subject):
+    return queue.find_one({'subject': subject})
+
+
+def _seconds_until(doc):
+    return (doc['available_at'] - datetime.datetime.utcnow()).total_seconds()
+
+
+def test_drain_sends_all_batches_over_one_connection(app, queue):
+    mail = FakeMail()
+    dispatcher = _dispatcher(app, mail, queue, batch_size=2)
+    _enqueue(app, dispatcher, *[f'Mesaj {i}' for i in range(5)])
+
+    assert dispatcher.drain() == 5
+    assert mail.connections == 1
+    assert mail.sent == [f'Mesaj {i}' for i in range(5)]
+    assert queue.count_documents({'status': SENT, 'attempts': 1}) == 5
+
+
+def test_connection_failure_retries_with_exponential_backoff(app, queue):
+    mail = FakeMail(connect_error=OSError('SMTP down'))
+    dispatcher = _dispatcher(app, mail, queue, retry_base_seconds=30, max_attempts=3)
+    _enqueue(app, dispatcher, 'Hatırlatma')
+
+    for attempt, delay in [(1, 30), (2, 60)]:
+        assert dispatcher.drain() == 0
+        doc = _doc(queue, 'Hatırlatma')
+        assert (doc['status'], doc['attempts'], doc['last_error']) == (PENDING, attempt, 'SMTP down')
+        assert delay - 5 < _seconds_until(doc) <= delay
+        # Bekleme süresini atla
+        queue.update_one({'_id': doc['_id']}, {'$set': {'available_at': datetime.datetime.utcnow()}})
+
+    assert dispatcher.drain() == 0
+    doc = _doc(queue, 'Hatırlatma')
+    assert (doc['status'], doc['attempts']) == (FAILED, 3)
+    assert 'available_at' not in doc
+    assert dispatcher.drain() == 0
+    assert mail.connections == 3
+
+
+def test_send_failure_releases_the_rest_of_the_batch(app, queue):
+    mail = FakeMail(fail_subjects={'Mesaj 1'})
+    dispatcher = _dispatcher(app, mail, queue, batch_size=3)
+    _enqueue(app, dispatcher, 'Mesaj 0', 'Mesaj 1', 'Mesaj 2')
+
+    assert dispatcher.drain() == 1
+    assert mail.sent == ['Mesaj 0']
+    assert _doc(queue, 'Mesaj 0')['status'] == SENT
+
+    failed = _doc(queue, 'Mesaj 1')
+    assert (failed['status'], failed['attempts']) == (PENDING, 1)
+    assert _seconds_until(failed) > 0
+
+    # Gönderilmeyen mesaj deneme sayılmadan hemen yeniden alınabilir
+    released = _doc(queue, 'Mesaj 2')
+    assert (released['status'], released['attempts']) == (PENDING, 0)
+    assert _seconds_until(released) <= 0
+
+    mail.fail_subjects.clear()
+    assert dispatcher.drain() == 1
+    assert mail.sent == ['Mesaj 0', 'Mesaj 2']
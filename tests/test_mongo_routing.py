@@ -0,0 +1,84 @@
+import threading
+import pytest
+from pymongo import monitoring
+from spending_storage import SPENDING_LOGS
+
+EMAIL = 'router@example.com'
+HEADERS = {'X-User-Email': EMAIL}
+READ_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+WRITE_COMMANDS = {'insert', 'update', 'delete', 'findAndModify'}
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """Komutların hangi sunucuya gönderildiğini kaydeder"""
+
+    def __init__(self):
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self.commands.append((event.command_name, collection, event.connection_id))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def take(self, collections, command_names):
+        with self._lock:
+            commands, self.commands = self.commands, []
+        return [address for name, collection, address in commands
+                if name in command_names and collection in collections]
+
+
+# Uygulamanın MongoClient'ı ilk sorguda oluşturulur; testler toplanırken kaydedilen dinleyici ona da eklenir
+recorder = CommandRecorder()
+monitoring.register(recorder)
+
+
+@pytest.fixture
+def servers(app, db):
+    from extensions import get_client
+    client = get_client()
+    client.admin.command('ping')
+    if not client.secondaries:
+        pytest.skip('Replica set has no readable secondary')
+    db.users.insert_one({'username': 'router', 'email': EMAIL, 'password': 'x'})
+    db.budgets.insert_one({'email': EMAIL, 'initial_budget': 1000})
+    recorder.take(set(), set())
+    return client.primary, client.secondaries
+
+
+def test_report_reads_go_to_secondary(client, servers):
+    primary, secondaries = servers
+    client.post('/generate_report', json={'report_type': 'monthly_balance', 'email': EMAIL, 'year': 2024})
+    addresses = recorder.take({'budgets', 'bills', 'credit_cards', SPENDING_LOGS}, READ_COMMANDS)
+    assert addresses and all(address in secondaries for address in addresses)
+
+
+@pytest.mark.parametrize('path', ['/home/messages', '/payments'])
+def test_summary_reads_go_to_secondary(client, servers, path):
+    primary, secondaries = servers
+    client.get(path, headers=HEADERS)
+    addresses = recorder.take({'budgets', 'bills', 'credit_cards', SPENDING_LOGS}, READ_COMMANDS)
+    assert addresses and all(address in secondaries for address in addresses)
+
+
+def test_job_reads_go_to_secondary(app, servers):
+    from jobs import check_and_send_bill_reminders
+    primary, secondaries = servers
+    with app.app_context():
+        check_and_send_bill_reminders()
+    addresses = recorder.take({'bills'}, READ_COMMANDS)
+    assert addresses and all(address in secondaries for address in addresses)
+
+
+def test_writes_go_to_primary(client, servers):
+    primary, secondaries = servers
+    assert client.post('/spending-log', headers=HEADERS, json={'category': 'Yemek', 'amount': 10}).status_code == 201
+    assert client.post('/budget', json={'email': EMAIL, 'initial_budget': 2000}).status_code == 200
+    addresses = recorder.take({'budgets', 'spending_totals', 'data_versions', SPENDING_LOGS}, WRITE_COMMANDS)
+    assert addresses and all(address == primary for address in addresses)
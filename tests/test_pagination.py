@@ -0,0 +1,28 @@
+EMAIL = 'pager@example.com'
+HEADERS = {'X-User-Email': EMAIL}
+
+
+def _seed_bills(db, count):
+    db.bills.insert_many([{'email': EMAIL, 'bill_name': f'Fatura {i}', 'amount': 10, 'is_paid': False,
+                           'category': 'Elektrik', 'end_date': f'2024-01-{i % 28 + 1:02d}'} for i in range(count)])
+
+
+def test_unpaid_bills_without_limit_returns_everything(client, db):
+    _seed_bills(db, 150)
+    body = client.get('/unpaid-bills', headers=HEADERS).get_json()
+    assert len(body['unpaid_bills']) == 150
+    assert body['next_cursor'] is None
+
+
+def test_unpaid_bills_pages_with_limit(client, db):
+    _seed_bills(db, 25)
+    names = []
+    cursor = None
+    while True:
+        query = {'limit': 10, **({'cursor': cursor} if cursor else {})}
+        body = client.get('/unpaid-bills', headers=HEADERS, query_string=query).get_json()
+        names.extend(bill['bill_name'] for bill in body['unpaid_bills'])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert sorted(names) == sorted(f'Fatura {i}' for i in range(25))
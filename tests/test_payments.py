@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+EMAIL = 'payer@example.com'
+HEADERS = {'X-User-Email': EMAIL}
+
+
+@pytest.mark.parametrize('amount', [-100, 0, 'abc', None, True, float('nan'), 'inf', '-1e3'])
+def test_make_payment_rejects_invalid_amount(client, amount):
+    response = client.post('/make-payment', headers=HEADERS, json={
+        'email': EMAIL, 'odeme_turu': 'bill', 'isim': 'Elektrik', 'odeme_tutari': amount
+    })
+    assert response.status_code == 400
+
+
+def _pay(app, payment_type, name, amount):
+    with app.test_client() as client:
+        return client.post('/make-payment', headers=HEADERS, json={
+            'email': EMAIL, 'odeme_turu': payment_type, 'isim': name, 'odeme_tutari': amount
+        }).status_code
+
+
+def _seed(db, budget):
+    db.users.insert_one({'username': 'payer', 'email': EMAIL, 'password': 'x'})
+    db.budgets.insert_one({'email': EMAIL, 'initial_budget': budget})
+
+
+def test_parallel_bill_payments_do_not_overdraw(app, db):
+    _seed(db, 1000)
+    db.bills.insert_many([{'email': EMAIL, 'bill_name': f'Fatura {i}', 'amount': 100, 'is_paid': False,
+                           'category': 'Elektrik', 'end_date': '2024-01-31'} for i in range(20)])
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        statuses = list(executor.map(lambda i: _pay(app, 'bill', f'Fatura {i}', 100), range(20)))
+
+    succeeded = statuses.count(200)
+    assert succeeded == 10
+    assert set(statuses) <= {200, 400}
+    budget = db.budgets.find_one({'email': EMAIL})['initial_budget']
+    assert budget == 1000 - 100 * succeeded
+    assert db.bills.count_documents({'email': EMAIL, 'is_paid': True}) == succeeded
+
+
+def test_parallel_card_payments_do_not_overdraw(app, db):
+    _seed(db, 1000)
+    db.credit_cards.insert_one({'email': EMAIL, 'bank_name': 'Garanti', 'card_limit': 10000,
+                                'due_date_start': '2024-01-01', 'due_date_end': '2024-01-31',
+                                'current_balance': 5000})
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        statuses = list(executor.map(lambda i: _pay(app, 'card', 'Garanti', 150), range(20)))
+
+    succeeded = statuses.count(200)
+    assert succeeded == 6
+    assert set(statuses) <= {200, 400}
+    budget = db.budgets.find_one({'email': EMAIL})['initial_budget']
+    assert budget == 1000 - 150 * succeeded
+    assert budget >= 0
+    assert db.credit_cards.find_one({'email': EMAIL})['current_balance'] == 5000 - 150 * succeeded
@@ -0,0 +1,28 @@
+import pytest
+
+EMAIL = 'reporter@example.com'
+
+
+@pytest.mark.parametrize('body', [
+    {'year': 'abc'},
+    {'year': 2024, 'end_year': 'x'},
+    {'year': None},
+    {'year': 2024.5},
+    {'year': True},
+    {'year': 0},
+    {'year': 2024, 'end_year': 2023},
+    {'year': 2015, 'end_year': 2024, 'granularity': 'week'},
+    {'year': 2020, 'end_year': 2024, 'granularity': 'day'},
+    {'year': 1, 'end_year': 9999},
+])
+def test_generate_report_rejects_invalid_years(client, body):
+    response = client.post('/generate_report', json={'report_type': 'monthly_balance', 'email': EMAIL, **body})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('months', ['abc', 0, 25, None])
+def test_cash_flow_forecast_rejects_invalid_months(client, db, months):
+    db.users.insert_one({'username': 'reporter', 'email': EMAIL, 'password': 'x'})
+    response = client.post('/generate_report', json={'report_type': 'cash_flow_forecast', 'email': EMAIL,
+                                                      'months': months})
+    assert response.status_code == 400
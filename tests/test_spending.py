@@ -0,0 +1,17 @@
+EMAIL = 'spender@example.com'
+HEADERS = {'X-User-Email': EMAIL}
+
+
+def test_spending_log_and_totals_are_written_together(client, db):
+    for amount in (100, 50):
+        response = client.post('/spending-log', headers=HEADERS, json={'category': 'Yemek', 'amount': amount})
+        assert response.status_code == 201
+
+    assert db.spending_logs.count_documents({'email': EMAIL}) == 2
+    total = db.spending_totals.find_one({'email': EMAIL, 'period': 'all', 'category': None})
+    assert (total['total'], total['count']) == (150, 2)
+
+    response = client.delete('/spending-log', headers=HEADERS, json={'category': 'Yemek'})
+    assert response.status_code == 200
+    assert db.spending_logs.count_documents({'email': EMAIL}) == 0
+    assert db.spending_totals.count_documents({'email': EMAIL}) == 0
@@ -0,0 +1,54 @@
+import datetime
+import io
+import pytest
+from spending_import import InvalidFile, RowError, normalize_row, read_rows
+
+DEFAULT_DATE = datetime.datetime(2024, 1, 1)
+
+
+def _rows(data, fmt='csv'):
+    return list(read_rows(io.BytesIO(data), fmt))
+
+
+def test_read_rows_csv_with_bom_and_quoted_newline():
+    rows = _rows('﻿date,category,amount\n2024-01-05,"Yemek\nakşam",150\n'.encode('utf-8'))
+    assert rows == [{'date': '2024-01-05', 'category': 'Yemek\nakşam', 'amount': '150'}]
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_read_rows_reports_row_of_invalid_utf8(fmt):
+    if fmt == 'csv':
+        data = b'category,amount\nYemek,10\nUla\xfe\xfe,20\n'
+    else:
+        data = b'{"category": "Yemek", "amount": 10}\n{"category": "Ula\xfe\xfe", "amount": 20}\n'
+    with pytest.raises(InvalidFile) as e:
+        _rows(data, fmt)
+    assert e.value.row == 2
+
+
+def test_read_rows_reports_row_of_broken_csv():
+    # csv.field_size_limit (131072) aşılırsa csv.Error
+    data = b'category,amount\nYemek,10\n' + b'x' * 200000 + b',20\n'
+    with pytest.raises(InvalidFile) as e:
+        _rows(data)
+    assert e.value.row == 2
+
+
+def test_normalize_row_converts_aware_dates_to_naive_local_time():
+    log = normalize_row({'category': 'Yemek', 'amount': '10', 'date': '2024-01-05T02:00:00+03:00'},
+                        'a@example.com', DEFAULT_DATE)
+    utc = datetime.datetime(2024, 1, 4, 23, 0, tzinfo=datetime.timezone.utc)
+    assert log['date'] == utc.astimezone().replace(tzinfo=None)
+    assert log['date'].tzinfo is None
+
+
+def test_normalize_row_rejects_invalid_date():
+    with pytest.raises(RowError):
+        normalize_row({'category': 'Yemek', 'amount': '10', 'date': '05/01/2024'}, 'a@example.com', DEFAULT_DATE)
+
+
+def test_import_rejects_undecodable_file(client):
+    response = client.post('/spending-log/import?format=csv', headers={'X-User-Email': 'a@example.com'},
+                           data=b'category,amount\n\xff\xfe,10\n')
+    assert response.status_code == 400
+    assert response.get_json()['errors'][-1]['row'] == 1